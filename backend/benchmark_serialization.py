@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for GET /api/resources
+
+Compares the old per-request path (validate every document against
+List[Resource], then JSON-encode) with the pre-serialized snapshot bodies,
+and checks that both produce identical bytes.
+
+Usage: cd backend && python benchmark_serialization.py [resource_count] [iterations]
+"""
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from server import Resource, ResourceSnapshot
+
+CATEGORIES = ["housing", "legal", "employment", "healthcare", "education", "food"]
+
+
+def make_resources(count: int) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Benchmark Resource {i}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "description": "Transitional housing with case management and employment support. " * 3,
+            "address": f"{i} Main St",
+            "city": "Minneapolis",
+            "state": "MN",
+            "zip_code": "55401",
+            "phone": "(612) 555-0100",
+            "website": "https://example.org",
+            "hours": "Mon-Fri 9am-5pm",
+            "services": ["Case Management", "Employment Support", "Housing Navigation"],
+            "latitude": 44.9778 + i * 0.0001,
+            "longitude": -93.2650 - i * 0.0001,
+            "serving_area": "Hennepin County",
+            "good_fit_if": "You want structured support while you look for work.",
+            "reentry_focused": True,
+            "cost": "Free",
+            "county": "Hennepin",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def per_request_body(adapter: TypeAdapter, resources: List[dict]) -> bytes:
+    """What FastAPI did for response_model=List[Resource] on every request"""
+    validated = adapter.validate_python(resources)
+    content = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+    return JSONResponse(content).body
+
+
+def measure(label: str, func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    per_second = iterations / elapsed
+    print(f"{label:<28} {elapsed / iterations * 1000:8.2f} ms/request  {per_second:10.1f} requests/s")
+    return per_second
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    resources = make_resources(count)
+    snapshot = ResourceSnapshot(1, resources)
+    adapter = TypeAdapter(List[Resource])
+    page, _ = snapshot.filter()
+
+    legacy = per_request_body(adapter, page)
+    fast = snapshot.encode_list(page)
+    assert legacy == fast, "Pre-serialized body differs from the per-request body"
+    print(f"Bodies identical ({len(fast):,} bytes for {len(page)} resources)\n")
+
+    baseline = measure("validate + encode", lambda: per_request_body(adapter, page), iterations)
+    joined = measure("pre-serialized join", lambda: snapshot.encode_list(page), iterations)
+    key = (None, None, None, None, None, count, None)
+    cached = measure("cached body", lambda: snapshot.cached_body(key, lambda: snapshot.encode_list(page)), iterations)
+
+    print(f"\nSpeedup: {joined / baseline:.1f}x (join), {cached / baseline:.1f}x (cached)")
+
+
+if __name__ == "__main__":
+    main()
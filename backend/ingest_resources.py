@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Bulk resource ingester
+
+Loads CSV, JSON or NDJSON files (or directories of them), validates every row against ResourceCreate and writes
+only new or changed resources, using batched bulk_write upserts. Rows are matched to stored resources on the
+same (name, city, address, zip_code) key as the seed data, and compared using a content hash kept on each document.
+
+CSV columns are ResourceCreate field names; `services` is "; "-separated, as in /api/resources/export, so an
+export can be edited and loaded back. JSON files hold a list of objects, NDJSON files one object per line.
+
+Usage: cd backend && python ingest_resources.py PATH [PATH ...] [--batch-size N] [--dry-run]
+"""
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+from pydantic import ValidationError
+
+from server import (
+    ResourceCreate, bump_dataset_version, classify_resource, client, db, natural_key, reserve_change_seqs, resource_upserts,
+    stored_content_hashes
+)
+
+SUPPORTED_SUFFIXES = {".csv", ".json", ".ndjson", ".jsonl"}
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 20
+
+
+def input_files(paths: List[str]) -> List[Path]:
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix.lower() in SUPPORTED_SUFFIXES))
+        else:
+            files.append(path)
+    return files
+
+
+def csv_row(row: dict) -> dict:
+    """Blank cells become missing fields, and services is split back into a list"""
+    row = {key: value.strip() for key, value in row.items() if key and value and value.strip()}
+    if "services" in row:
+        row["services"] = [service.strip() for service in row["services"].split(";") if service.strip()]
+    return row
+
+
+class UnreadableRow(Exception):
+    """A row that could not be decoded; read_rows yields it in place of the row so the run can go on"""
+
+
+def has_undecodable_text(value) -> bool:
+    """Whether a parsed value holds bytes that were not valid UTF-8 (kept as lone surrogates by surrogateescape)"""
+    if isinstance(value, str):
+        return any("\udc80" <= char <= "\udcff" for char in value)
+    if isinstance(value, dict):
+        return any(has_undecodable_text(item) for item in value.values())
+    if isinstance(value, list):
+        return any(has_undecodable_text(item) for item in value)
+    return False
+
+
+def parsed_rows(path: Path, f):
+    """Yield (line number, row) as parsed from the file's format, without validating the rows"""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        reader = csv.DictReader(f)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                # The reader has already consumed the bad line, so it can carry on from the next one
+                yield reader.reader.line_num, UnreadableRow(f"invalid CSV: {e}")
+                continue
+            yield reader.line_num, csv_row(row)
+    elif suffix in (".ndjson", ".jsonl"):
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, UnreadableRow(f"invalid JSON: {e.msg} at column {e.colno}")
+    else:
+        try:
+            rows = json.load(f)
+        except json.JSONDecodeError as e:
+            # A broken JSON document can't be split into rows, so the rest of the file is one rejected row
+            yield e.lineno, UnreadableRow(f"invalid JSON: {e.msg} at column {e.colno}, rest of file skipped")
+            return
+        if not isinstance(rows, list):
+            yield 1, UnreadableRow("expected a JSON array of objects")
+            return
+        yield from enumerate(rows, start=1)
+
+
+def read_rows(path: Path):
+    """Yield (line number, raw row) from one input file; rows that can't be decoded come as UnreadableRow"""
+    with open(path, encoding="utf-8-sig", errors="surrogateescape", newline="") as f:
+        for number, row in parsed_rows(path, f):
+            if not isinstance(row, UnreadableRow) and has_undecodable_text(row):
+                row = UnreadableRow("text is not valid UTF-8")
+            yield number, row
+
+
+class Ingest:
+    """Counters and progress output for one run"""
+
+    def __init__(self, batch_size: int, dry_run: bool):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.started = time.perf_counter()
+        self.read = 0
+        self.invalid = 0
+        self.duplicates = 0
+        self.unchanged = 0
+        self.added = 0
+        self.updated = 0
+        # Set once a batch has been sent, since even a failed unordered bulk write may have applied some rows
+        self.wrote = False
+        self.errors: List[str] = []
+
+    def reject(self, location: str, error: Exception):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            if isinstance(error, ValidationError):
+                first = error.errors()[0]
+                field = ".".join(str(part) for part in first["loc"]) or "row"
+                self.errors.append(f"{location}: {field}: {first['msg']}")
+            else:
+                self.errors.append(f"{location}: {error}")
+
+    def progress(self, final: bool = False):
+        elapsed = time.perf_counter() - self.started
+        rate = self.read / elapsed if elapsed else 0.0
+        line = (f"{self.read:,} rows read, {self.added:,} added, {self.updated:,} updated, "
+                f"{self.unchanged:,} unchanged, {self.invalid:,} invalid  ({rate:,.0f} rows/s)")
+        print(f"\r{line}", end="\n" if final else "", file=sys.stderr, flush=True)
+
+    async def write(self, batch: List[tuple]):
+        """Upsert one batch; id and created_at are only written for resources that are new"""
+        if not self.dry_run:
+            changes = [(resource, digest) for resource, digest, _ in batch]
+            async with reserve_change_seqs(len(changes)) as seqs:
+                operations = resource_upserts(changes, datetime.now(timezone.utc), seqs)
+                self.wrote = True
+                await db.resources.bulk_write(operations, ordered=False)
+        new = sum(1 for _, _, is_new in batch if is_new)
+        self.added += new
+        self.updated += len(batch) - new
+        self.progress()
+
+    async def run(self, files: List[Path]):
+        existing = await stored_content_hashes()
+        print(f"{len(existing):,} resources already stored", file=sys.stderr)
+
+        seen = set()
+        batch = []
+        for path in files:
+            for number, raw in read_rows(path):
+                self.read += 1
+                if isinstance(raw, UnreadableRow):
+                    self.reject(f"{path}:{number}", raw)
+                    continue
+                try:
+                    resource = ResourceCreate.model_validate(raw).model_dump()
+                except ValidationError as e:
+                    self.reject(f"{path}:{number}", e)
+                    continue
+
+                key = natural_key(resource)
+                if key in seen:
+                    # Unordered bulk writes could apply two rows for one key in either order, so the first wins
+                    self.duplicates += 1
+                    continue
+                seen.add(key)
+
+                status, digest = classify_resource(resource, existing)
+                if status == "unchanged":
+                    self.unchanged += 1
+                    continue
+                batch.append((resource, digest, status == "new"))
+                if len(batch) >= self.batch_size:
+                    await self.write(batch)
+                    batch = []
+        if batch:
+            await self.write(batch)
+        self.progress(final=True)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load resources from CSV, JSON or NDJSON files")
+    parser.add_argument("paths", nargs="+", help="files, or directories searched for .csv/.json/.ndjson files")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="validate and diff without writing")
+    args = parser.parse_args()
+
+    files = input_files(args.paths)
+    if not files:
+        parser.error("no input files found")
+
+    ingest = Ingest(args.batch_size, args.dry_run)
+    try:
+        await ingest.run(files)
+    finally:
+        # Publish whatever was written even if a later batch failed, so workers don't keep serving stale data
+        try:
+            if ingest.wrote:
+                version = await bump_dataset_version()
+                print(f"Published dataset version {version}", file=sys.stderr)
+        finally:
+            client.close()
+    if args.dry_run and (ingest.added or ingest.updated):
+        print("Dry run, nothing written", file=sys.stderr)
+
+    if ingest.duplicates:
+        print(f"Skipped {ingest.duplicates:,} rows repeating an earlier (name, city, address, zip_code)", file=sys.stderr)
+    for error in ingest.errors:
+        print(f"  {error}", file=sys.stderr)
+    if ingest.invalid > len(ingest.errors):
+        print(f"  ... and {ingest.invalid - len(ingest.errors):,} more invalid rows", file=sys.stderr)
+    return 1 if ingest.invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,14 +1,37 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, UpdateOne, ReturnDocument
+from pymongo.errors import OperationFailure, DuplicateKeyError
 import os
+import re
+import time
+import asyncio
+import math
+import random
+import bisect
+import io
+import csv
+import json
+import base64
+import hashlib
+import gzip
 import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict, OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
+from typing_extensions import TypedDict
+from typing import Dict, List, Optional, Tuple
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+import orjson
+import httpx
+import litellm
 from emergentintegrations.llm.chat import LlmChat, UserMessage
 
 ROOT_DIR = Path(__file__).parent
@@ -16,11 +39,14 @@ load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[os.environ['DB_NAME']]
 
 # LLM Configuration
 EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY')
+# Endpoint for streamed completions when the key is served by a proxy rather than the model provider itself
+LLM_API_BASE = os.environ.get('LLM_API_BASE')
+LLM_PROVIDER = os.environ.get('LLM_PROVIDER', 'emergent')
 
 # Create the main app
 app = FastAPI()
@@ -63,9 +89,13 @@ class Resource(BaseModel):
     what_to_expect: Optional[str] = None
     reentry_focused: bool = True
     cost: Optional[str] = None
+    county: Optional[str] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class NearbyResource(Resource):
+    distance_km: float
+
 class ResourceCreate(BaseModel):
     name: str
     category: str
@@ -115,6 +145,691 @@ class ResourceSubmission(BaseModel):
     services: Optional[str] = None
     submitterEmail: Optional[str] = None
 
+# ============== SEARCH INDEX ==============
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+class SearchIndex:
+    """In-memory inverted index over resource name, description and services, ranked with BM25"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(dict)  # term -> {resource_id: term frequency}
+        self.doc_lengths = {}
+        self.total_length = 0
+        self._vocabulary = None
+
+    def _document_terms(self, resource: dict) -> List[str]:
+        parts = [resource.get("name") or "", resource.get("description") or ""]
+        parts.extend(resource.get("services") or [])
+        return tokenize(" ".join(parts))
+
+    def add(self, resource: dict):
+        """Index a resource; the index is built once per snapshot, so each id is only ever added once"""
+        resource_id = resource["id"]
+        terms = self._document_terms(resource)
+        for term in terms:
+            postings = self.postings[term]
+            postings[resource_id] = postings.get(resource_id, 0) + 1
+        self.doc_lengths[resource_id] = len(terms)
+        self.total_length += len(terms)
+        self._vocabulary = None
+
+    def _expand(self, term: str) -> List[str]:
+        """Terms in the vocabulary starting with the given prefix (for search-as-you-type)"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + "\uffff")
+        return self._vocabulary[start:end]
+
+    def scores(self, query: str) -> dict:
+        """BM25 score for every resource matching at least one query term"""
+        terms = tokenize(query)
+        if not terms or not self.doc_lengths:
+            return {}
+        # The last term may be partially typed, so it also matches by prefix
+        query_terms = set(terms[:-1])
+        query_terms.update(self._expand(terms[-1]))
+
+        doc_count = len(self.doc_lengths)
+        avg_length = self.total_length / doc_count or 1
+        scores = defaultdict(float)
+        for term in query_terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for resource_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[resource_id] / avg_length)
+                scores[resource_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+# ============== GEO INDEX ==============
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+class GeoIndex:
+    """Uniform lat/long grid over resource coordinates for nearest-neighbour queries"""
+
+    def __init__(self, cell_size: float = 0.1):
+        self.cell_size = cell_size  # degrees, roughly 11 km of latitude
+        self.cells = defaultdict(dict)  # (row, col) -> {resource_id: (lat, lng)}
+        self.locations = {}  # resource_id -> (row, col)
+        self._bounds = None
+
+    def _cell(self, lat: float, lng: float):
+        return (math.floor(lat / self.cell_size), math.floor(lng / self.cell_size))
+
+    def add(self, resource: dict):
+        resource_id = resource["id"]
+        self.remove(resource_id)
+        lat, lng = resource["latitude"], resource["longitude"]
+        cell = self._cell(lat, lng)
+        self.cells[cell][resource_id] = (lat, lng)
+        self.locations[resource_id] = cell
+        self._bounds = None
+
+    def remove(self, resource_id: str):
+        cell = self.locations.pop(resource_id, None)
+        if cell is None:
+            return
+        del self.cells[cell][resource_id]
+        if not self.cells[cell]:
+            del self.cells[cell]
+        self._bounds = None
+
+    def _ring(self, center, radius: int):
+        row, col = center
+        if radius == 0:
+            yield center
+            return
+        for c in range(col - radius, col + radius + 1):
+            yield (row - radius, c)
+            yield (row + radius, c)
+        for r in range(row - radius + 1, row + radius):
+            yield (r, col - radius)
+            yield (r, col + radius)
+
+    def nearest(self, lat: float, lng: float, radius_km: float, limit: int):
+        """Return up to `limit` (resource_id, distance_km) pairs within radius_km, nearest first"""
+        if not self.cells:
+            return []
+        if self._bounds is None:
+            rows = [cell[0] for cell in self.cells]
+            cols = [cell[1] for cell in self.cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+        min_row, max_row, min_col, max_col = self._bounds
+        center = self._cell(lat, lng)
+        # Rings beyond the occupied area cannot contain anything
+        max_ring = max(
+            abs(center[0] - min_row), abs(center[0] - max_row),
+            abs(center[1] - min_col), abs(center[1] - max_col),
+        )
+
+        found = []
+        ring = 0
+        while ring <= max_ring:
+            if (2 * ring + 1) ** 2 > len(self.cells):
+                # The walk would now visit more cells than are occupied (rings cover almost no ground near the
+                # poles, so far-away queries get here quickly), and scanning the occupied ones is cheaper
+                return self._scan(lat, lng, radius_km, limit)
+            for cell in self._ring(center, ring):
+                for resource_id, (r_lat, r_lng) in self.cells.get(cell, {}).items():
+                    distance = haversine_km(lat, lng, r_lat, r_lng)
+                    if distance <= radius_km:
+                        found.append((resource_id, distance))
+            # Everything closer than `covered_km` has now been visited
+            edge_lat = min(89.9, abs(lat) + (ring + 1) * self.cell_size)
+            covered_km = ring * self.cell_size * KM_PER_DEGREE * math.cos(math.radians(edge_lat))
+            if covered_km >= radius_km:
+                break
+            if len(found) >= limit and sorted(d for _, d in found)[limit - 1] <= covered_km:
+                break
+            ring += 1
+
+        found.sort(key=lambda item: item[1])
+        return found[:limit]
+
+    def _scan(self, lat: float, lng: float, radius_km: float, limit: int):
+        found = []
+        for cell in self.cells.values():
+            for resource_id, (r_lat, r_lng) in cell.items():
+                distance = haversine_km(lat, lng, r_lat, r_lng)
+                if distance <= radius_km:
+                    found.append((resource_id, distance))
+        found.sort(key=lambda item: item[1])
+        return found[:limit]
+
+# ============== COUNTY LOOKUP ==============
+
+COUNTY_BOUNDARIES_FILE = ROOT_DIR / 'data' / 'mn_counties.geojson'
+
+def point_in_ring(lng: float, lat: float, ring: List[List[float]]) -> bool:
+    """Ray-casting test for a point against a closed [lng, lat] ring"""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if (yi > lat) != (yj > lat) and lng < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+class CountyLocator:
+    """Assigns a Minnesota county to a coordinate using the bundled county boundary polygons"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._counties = None
+
+    def _load(self):
+        with open(self.path) as f:
+            features = json.load(f)["features"]
+        counties = []
+        for feature in features:
+            rings = feature["geometry"]["coordinates"]
+            lngs = [point[0] for point in rings[0]]
+            lats = [point[1] for point in rings[0]]
+            bbox = (min(lngs), min(lats), max(lngs), max(lats))
+            counties.append((feature["properties"]["name"], bbox, rings))
+        self._counties = counties
+
+    def locate(self, lat: float, lng: float) -> Optional[str]:
+        if self._counties is None:
+            self._load()
+        for name, (min_lng, min_lat, max_lng, max_lat), rings in self._counties:
+            if not (min_lng <= lng <= max_lng and min_lat <= lat <= max_lat):
+                continue
+            outer, holes = rings[0], rings[1:]
+            if point_in_ring(lng, lat, outer) and not any(point_in_ring(lng, lat, hole) for hole in holes):
+                return name
+        return None
+
+county_locator = CountyLocator(COUNTY_BOUNDARIES_FILE)
+
+async def assign_missing_counties():
+    """Backfill `county` on resources stored before county assignment existed"""
+    cursor = db.resources.find({"county": {"$exists": False}}, {"_id": 0, "id": 1, "latitude": 1, "longitude": 1})
+    resources = await cursor.to_list(None)
+    if resources:
+        async with reserve_change_seqs(len(resources)) as seqs:
+            updates = [
+                UpdateOne(
+                    {"id": resource["id"]},
+                    {"$set": {"county": county_locator.locate(resource["latitude"], resource["longitude"]), "change_seq": seq}}
+                )
+                for resource, seq in zip(resources, seqs)
+            ]
+            await db.resources.bulk_write(updates, ordered=False)
+        logger.info(f"Assigned counties to {len(updates)} existing resources")
+
+# ============== DATETIME MIGRATION ==============
+
+# Timestamps used to be written as ISO strings; they are now stored as native BSON dates
+DATETIME_FIELDS = {
+    "resources": ("created_at", "updated_at"),
+    "submissions": ("submitted_at",),
+}
+MIGRATION_BATCH_SIZE = 500
+
+def parse_iso_datetime(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+async def migrate_string_datetimes(batch_size: int = MIGRATION_BATCH_SIZE):
+    """One-shot conversion of string timestamps to BSON dates; a no-op once nothing is string-typed"""
+    for collection_name, fields in DATETIME_FIELDS.items():
+        collection = db[collection_name]
+        query = {"$or": [{field: {"$type": "string"}} for field in fields]}
+        projection = {field: 1 for field in fields}
+        updates = []
+        converted = 0
+        async for doc in collection.find(query, projection):
+            changes = {field: parse_iso_datetime(doc[field]) for field in fields if isinstance(doc.get(field), str)}
+            updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": changes}))
+            if len(updates) >= batch_size:
+                await collection.bulk_write(updates, ordered=False)
+                converted += len(updates)
+                updates = []
+        if updates:
+            await collection.bulk_write(updates, ordered=False)
+            converted += len(updates)
+        if converted:
+            logger.info(f"Converted string timestamps to dates on {converted} {collection_name} documents")
+
+# ============== INDEXES ==============
+
+# Every Mongo query the API still issues, and the index that serves it.
+# Search and geo lookups are answered by the in-memory BM25 and grid indexes, so no text or 2dsphere index is kept.
+INDEXES = {
+    "resources": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("category", ASCENDING)], {}),
+        ([("city", ASCENDING)], {}),
+        ([("county", ASCENDING)], {}),
+        ([("updated_at", ASCENDING)], {}),
+        # The natural key seeding and ingest upsert on; not unique, since the API may list a resource twice
+        ([("name", ASCENDING), ("city", ASCENDING), ("address", ASCENDING), ("zip_code", ASCENDING)], {}),
+        ([("change_seq", ASCENDING)], {}),
+    ],
+    "resource_tombstones": [
+        ([("change_seq", ASCENDING)], {}),
+    ],
+    "submissions": [
+        ([("status", ASCENDING), ("submitted_at", DESCENDING)], {}),
+    ],
+}
+
+# (description, collection, filter, sort) for each endpoint's canonical query, checked with explain()
+CANONICAL_QUERIES = [
+    ("get resource by id", "resources", {"id": "canonical-check"}, None),
+    ("resources by category", "resources", {"category": "housing"}, None),
+    ("resources by city", "resources", {"city": "Minneapolis"}, None),
+    ("resources missing county", "resources", {"county": {"$exists": False}}, None),
+    ("seed upsert by natural key", "resources",
+     {"name": "canonical-check", "city": "Minneapolis", "address": "1 Main St", "zip_code": "55401"}, None),
+    ("changes since", "resources", {"change_seq": {"$gt": 0}}, [("change_seq", ASCENDING)]),
+    ("deletions since", "resource_tombstones", {"change_seq": {"$gt": 0}}, [("change_seq", ASCENDING)]),
+    ("resources missing change_seq", "resources", {"change_seq": {"$exists": False}}, None),
+    ("export in id order", "resources", {}, [("id", ASCENDING)]),
+    ("pending submissions", "submissions", {"status": "pending"}, [("submitted_at", DESCENDING)]),
+]
+
+# Indexes earlier versions created that are no longer in INDEXES, dropped at startup if present
+RETIRED_INDEXES = {
+    "resources": ["name_1_city_1"],  # (name, city) was briefly unique, which rejected branches sharing a name
+}
+
+async def ensure_indexes():
+    """Create the indexes above; create_index is a no-op for ones that already exist"""
+    for collection_name, names in RETIRED_INDEXES.items():
+        existing = await db[collection_name].index_information()
+        for name in names:
+            if name in existing:
+                await db[collection_name].drop_index(name)
+                logger.info(f"Dropped retired index {name} on {collection_name}")
+    for collection_name, indexes in INDEXES.items():
+        for keys, options in indexes:
+            try:
+                await db[collection_name].create_index(keys, **options)
+            except OperationFailure as e:
+                logger.error(f"Could not create index {keys} on {collection_name}: {e}")
+
+def plan_stages(plan: dict):
+    yield plan.get("stage")
+    for child in [plan.get("inputStage")] + plan.get("inputStages", []):
+        if child:
+            yield from plan_stages(child)
+
+async def verify_query_plans():
+    """Warn about any canonical query whose winning plan is still a collection scan"""
+    for description, collection_name, query, sort in CANONICAL_QUERIES:
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        try:
+            explained = await cursor.explain()
+        except Exception as e:
+            logger.warning(f"Could not explain '{description}' query: {e}")
+            continue
+        winning_plan = explained.get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in plan_stages(winning_plan):
+            logger.warning(f"Query '{description}' on {collection_name} is a COLLSCAN: {query}")
+
+# ============== CHANGE SEQUENCE ==============
+
+# Every write to a resource stamps it with the next value of one shared counter, and every deletion leaves a
+# tombstone with its own value, so /api/resources/changes can replay writes in order from any point.
+# Numbers are reserved before the write that uses them commits, so writes can land out of order. Each reservation
+# stays listed as in flight on the counter document until its write finishes, and the feed never reads past the
+# first one still open; otherwise a client could be handed a token beyond a change it has not seen yet.
+
+# A reservation left open by a crashed writer stops holding the feed back after this long
+CHANGE_RESERVATION_TTL_SECONDS = float(os.environ.get('CHANGE_RESERVATION_TTL_SECONDS', '300'))
+
+async def next_change_seqs(count: int) -> range:
+    """Reserve `count` consecutive change sequence numbers and mark them in flight"""
+    while True:
+        meta = await db.meta.find_one({"_id": "changes"}, {"seq": 1})
+        if meta is None:
+            try:
+                await db.meta.insert_one({"_id": "changes", "seq": 0, "in_flight": []})
+            except DuplicateKeyError:
+                pass
+            continue
+        first = meta["seq"] + 1
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=CHANGE_RESERVATION_TTL_SECONDS)
+        # Compare-and-set on the counter, so a range is never visible without its in-flight entry
+        result = await db.meta.update_one(
+            {"_id": "changes", "seq": meta["seq"]},
+            {"$set": {"seq": meta["seq"] + count}, "$push": {"in_flight": {"first": first, "expires_at": expires_at}}}
+        )
+        if result.modified_count:
+            return range(first, first + count)
+
+@asynccontextmanager
+async def reserve_change_seqs(count: int):
+    """Change sequence numbers for one write; the feed holds back at them until the block exits"""
+    seqs = await next_change_seqs(count)
+    try:
+        yield seqs
+    finally:
+        await db.meta.update_one({"_id": "changes"}, {"$pull": {"in_flight": {"first": seqs.start}}})
+
+async def committed_change_seq() -> int:
+    """Highest change sequence number below every write still in flight"""
+    meta = await db.meta.find_one({"_id": "changes"})
+    if meta is None:
+        return 0
+    now = datetime.now(timezone.utc)
+    in_flight = meta.get("in_flight", [])
+    open_firsts = [entry["first"] for entry in in_flight if entry["expires_at"] > now]
+    if len(open_firsts) < len(in_flight):
+        # Drop reservations abandoned by crashed writers so the list doesn't grow without limit
+        await db.meta.update_one({"_id": "changes"}, {"$pull": {"in_flight": {"expires_at": {"$lte": now}}}})
+    return min(open_firsts) - 1 if open_firsts else meta["seq"]
+
+async def assign_missing_change_seqs():
+    """Backfill `change_seq` on resources stored before the change feed existed"""
+    ids = [doc["id"] async for doc in db.resources.find({"change_seq": {"$exists": False}}, {"_id": 0, "id": 1})]
+    if not ids:
+        return
+    async with reserve_change_seqs(len(ids)) as seqs:
+        await db.resources.bulk_write(
+            [UpdateOne({"id": resource_id}, {"$set": {"change_seq": seq}}) for resource_id, seq in zip(ids, seqs)],
+            ordered=False
+        )
+    logger.info(f"Assigned change sequence numbers to {len(ids)} existing resources")
+
+# ============== JSON ENCODING ==============
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        # Match pydantic's JSON output, which writes UTC as "Z"
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def encode_json(value) -> bytes:
+    """orjson encoding that is byte-for-byte what FastAPI's default JSONResponse produces for our models"""
+    return orjson.dumps(value, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+def json_response(body: bytes, response: Response) -> Response:
+    """Raw JSON response carrying the headers already set on the endpoint's `response`"""
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
+
+# ============== RESOURCE SNAPSHOT ==============
+
+# How often each worker checks Mongo for a newer dataset version written by another worker
+SNAPSHOT_REFRESH_SECONDS = float(os.environ.get('SNAPSHOT_REFRESH_SECONDS', '5'))
+MAX_RESULTS = 1000
+# Encoded list bodies kept per snapshot, keyed by query
+BODY_CACHE_SIZE = int(os.environ.get('BODY_CACHE_SIZE', '256'))
+
+def encode_cursor(sort_key: tuple, version: Optional[int] = None) -> str:
+    """Opaque cursor for a sort key; ranked cursors also carry the dataset version their scores came from"""
+    payload = list(sort_key) if version is None else [*sort_key, version]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, ranked: bool, version: int) -> tuple:
+    """Parse an opaque cursor back into the sort key it was made from
+
+    (name, id) keys are stable across snapshots, but BM25 scores shift whenever the corpus changes, so a
+    ranked cursor is only honoured by the dataset version that issued it.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        if ranked:
+            first, resource_id, cursor_version = payload
+        else:
+            first, resource_id = payload
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    expected = (int, float) if ranked else str
+    if not isinstance(first, expected) or isinstance(first, bool) or not isinstance(resource_id, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if ranked and cursor_version != version:
+        raise HTTPException(status_code=400, detail="Search cursor is from an older dataset version, restart the search")
+    return (first, resource_id)
+
+class ResourceSnapshot:
+    """Immutable, versioned copy of the whole resources collection with its search and geo indexes"""
+
+    def __init__(self, version: int, resources: List[dict]):
+        self.version = version
+        # Listings are kept in (name, id) order, the stable key that list cursors point into
+        self.resources = tuple(sorted(resources, key=lambda resource: (resource["name"], resource["id"])))
+        self.sort_keys = [(resource["name"], resource["id"]) for resource in self.resources]
+        self.by_id = {resource["id"]: resource for resource in resources}
+        self.search_index = SearchIndex()
+        self.geo_index = GeoIndex()
+        for resource in resources:
+            self.search_index.add(resource)
+            self.geo_index.add(resource)
+        # Documents were validated when written; run them through the model once here so reads can skip it
+        self.encoded = {
+            resource["id"]: encode_json(Resource.model_validate(resource).model_dump())
+            for resource in resources
+        }
+        self._bodies = OrderedDict()
+        self.by_category = defaultdict(list)
+        for resource in self.resources:
+            self.by_category[resource["category"]].append(resource)
+        self.place_names = {resource["city"] for resource in resources}
+        self.place_names.update(resource["county"] for resource in resources if resource.get("county"))
+        self.loaded_at = datetime.now(timezone.utc)
+
+    def encode_list(self, resources: List[dict]) -> bytes:
+        return b"[" + b",".join(self.encoded[resource["id"]] for resource in resources) + b"]"
+
+    def cached_body(self, key: tuple, build):
+        """LRU cache of encoded response bodies for this version; `build` runs on a miss"""
+        cached = self._bodies.get(key)
+        if cached is not None:
+            self._bodies.move_to_end(key)
+            return cached
+        cached = build()
+        self._bodies[key] = cached
+        if len(self._bodies) > BODY_CACHE_SIZE:
+            self._bodies.popitem(last=False)
+        return cached
+
+    def filter(
+        self,
+        category: Optional[str] = None,
+        city: Optional[str] = None,
+        county: Optional[str] = None,
+        search: Optional[str] = None,
+        after: Optional[tuple] = None,
+        limit: int = MAX_RESULTS
+    ) -> Tuple[List[dict], Optional[tuple]]:
+        """Return one page of matching resources and the sort key to resume after, if there are more
+
+        Plain listings are ordered by (name, id); searches by (-score, id) so the best match comes first.
+        """
+        if search:
+            scores = self.search_index.scores(search)
+            keys = sorted((-score, resource_id) for resource_id, score in scores.items())
+            candidates = [self.by_id[resource_id] for _, resource_id in keys]
+        else:
+            keys = self.sort_keys
+            candidates = self.resources
+        start = bisect.bisect_right(keys, after) if after else 0
+        city = city.lower() if city else None
+        
+        results = []
+        last_position = None
+        for position in range(start, len(candidates)):
+            resource = candidates[position]
+            if category and resource["category"] != category:
+                continue
+            if city and city not in resource["city"].lower():
+                continue
+            if county and resource.get("county") != county:
+                continue
+            if len(results) == limit:
+                # More matches remain; an empty page (limit=0) resumes where it started
+                return results, keys[last_position] if results else after
+            results.append(resource)
+            last_position = position
+        return results, None
+
+    def nearest(self, lat: float, lng: float, radius_km: float, limit: int) -> List[dict]:
+        return [
+            {**self.by_id[resource_id], "distance_km": round(distance, 2)}
+            for resource_id, distance in self.geo_index.nearest(lat, lng, radius_km, limit)
+        ]
+
+snapshot = ResourceSnapshot(0, [])
+_snapshot_checked_at = 0.0
+_snapshot_lock = asyncio.Lock()
+
+async def read_dataset_version() -> int:
+    meta = await db.meta.find_one({"_id": "resources"})
+    return meta["version"] if meta else 0
+
+async def load_snapshot(version: Optional[int] = None):
+    """Read the whole collection into a new snapshot and swap it in"""
+    global snapshot, _snapshot_checked_at
+    if version is None:
+        version = await read_dataset_version()
+    resources = await db.resources.find({}, {"_id": 0}).to_list(None)
+    # Indexing, validation and encoding take about a second at 20k resources, so keep them off the event loop
+    snapshot = await asyncio.to_thread(ResourceSnapshot, version, resources)
+    _snapshot_checked_at = time.monotonic()
+    logger.info(f"Loaded resource snapshot v{version} with {len(resources)} resources")
+
+async def bump_dataset_version() -> int:
+    """Mark the resources collection as changed; every worker reloads within SNAPSHOT_REFRESH_SECONDS"""
+    meta = await db.meta.find_one_and_update(
+        {"_id": "resources"},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return meta["version"]
+
+async def publish_resource_change():
+    """Bump the shared dataset version after a write and reload this worker's snapshot"""
+    async with _snapshot_lock:
+        await load_snapshot(await bump_dataset_version())
+
+async def get_snapshot() -> ResourceSnapshot:
+    """Current snapshot, reloaded if another worker has published a newer version"""
+    global _snapshot_checked_at
+    if time.monotonic() - _snapshot_checked_at < SNAPSHOT_REFRESH_SECONDS:
+        return snapshot
+    async with _snapshot_lock:
+        if time.monotonic() - _snapshot_checked_at >= SNAPSHOT_REFRESH_SECONDS:
+            version = await read_dataset_version()
+            if version != snapshot.version:
+                await load_snapshot(version)
+            _snapshot_checked_at = time.monotonic()
+    return snapshot
+
+# ============== HTTP CACHING ==============
+
+CATEGORIES = [
+    {"id": "housing", "name": "Housing & Shelter", "icon": "Home"},
+    {"id": "legal", "name": "Legal Aid", "icon": "Scale"},
+    {"id": "employment", "name": "Employment Services", "icon": "Briefcase"},
+    {"id": "healthcare", "name": "Healthcare & Mental Health", "icon": "Heart"},
+    {"id": "education", "name": "Education & Training", "icon": "GraduationCap"},
+    {"id": "food", "name": "Food Assistance", "icon": "Utensils"}
+]
+
+# Resources can change at any time, so clients must revalidate (a cheap 304) before reuse
+RESOURCE_CACHE_CONTROL = "public, no-cache"
+CATEGORY_CACHE_CONTROL = "public, max-age=3600"
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+CATEGORIES_ETAG = make_etag(json.dumps(CATEGORIES, sort_keys=True))
+
+def conditional_response(request: Request, response: Response, etag: str, cache_control: str) -> Optional[Response]:
+    """Return a 304 if the client already holds `etag`, otherwise tag the outgoing response
+
+    Headers already set on `response` (such as Vary) are carried onto the 304 as well.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # If-None-Match uses weak comparison, so W/"x" matches "x"
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or etag in tags:
+            return Response(status_code=304, headers={**response.headers, **headers})
+    response.headers.update(headers)
+    return None
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """Whether an Accept-Encoding value allows `coding`; q=0 is a refusal and * covers unlisted codings"""
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name.strip():
+            qualities[name.strip().lower()] = quality
+    return qualities.get(coding, qualities.get("*", 0.0)) > 0
+
+# ============== FIELD PROJECTION ==============
+
+# Named field sets accepted by `fields=`, e.g. the compact card used by list and map views
+FIELD_PRESETS = {
+    "card": ["id", "name", "category", "city", "latitude", "longitude"],
+}
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Expand a comma-separated `fields=` value (names or presets) into Resource field names"""
+    if not fields:
+        return None
+    names = ["id"]
+    for name in (part.strip() for part in fields.split(",")):
+        if name:
+            names.extend(FIELD_PRESETS.get(name, [name]))
+    unknown = [name for name in names if name not in Resource.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(names))
+
+@lru_cache(maxsize=128)
+def projected_list_adapter(model: type, fields: Tuple[str, ...]) -> TypeAdapter:
+    """Serializer for a list of `model` restricted to `fields`, built once per field set
+
+    The partial type is a TypedDict, so snapshot dicts serialize directly and keys outside `fields` are dropped.
+    """
+    partial = TypedDict(
+        f"{model.__name__}Fields",
+        {name: model.model_fields[name].annotation for name in fields},
+        total=False
+    )
+    return TypeAdapter(List[partial])
+
+def projected_response(model: type, fields: Tuple[str, ...], items: List[dict], response: Response) -> Response:
+    return json_response(projected_list_adapter(model, fields).dump_json(items), response)
+
 # ============== RESOURCE ENDPOINTS ==============
 
 @api_router.get("/")
@@ -123,78 +838,473 @@ async def root():
 
 @api_router.get("/resources", response_model=List[Resource])
 async def get_resources(
+    request: Request,
+    response: Response,
     category: Optional[str] = Query(None),
     city: Optional[str] = Query(None),
-    search: Optional[str] = Query(None)
+    county: Optional[str] = Query(None),
+    search: Optional[str] = Query(None),
+    limit: int = Query(MAX_RESULTS, ge=1, le=MAX_RESULTS),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None)
 ):
-    query = {}
+    projection = parse_fields(fields)
+    current = await get_snapshot()
+    after = decode_cursor(cursor, ranked=bool(search), version=current.version) if cursor else None
+    etag = make_etag("resources", current.version, category, city, county, search, limit, cursor, projection)
+    not_modified = conditional_response(request, response, etag, RESOURCE_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
     
-    if category:
-        query["category"] = category
-    if city:
-        query["city"] = {"$regex": city, "$options": "i"}
-    if search:
-        query["$or"] = [
-            {"name": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}},
-            {"services": {"$elemMatch": {"$regex": search, "$options": "i"}}}
-        ]
+    def build():
+        page, next_key = current.filter(
+            category=category, city=city, county=county, search=search, after=after, limit=limit
+        )
+        if projection:
+            body = projected_list_adapter(Resource, projection).dump_json(page)
+        else:
+            body = current.encode_list(page)
+        return body, next_key
     
-    resources = await db.resources.find(query, {"_id": 0}).to_list(1000)
-    
-    for resource in resources:
-        if isinstance(resource.get('created_at'), str):
-            resource['created_at'] = datetime.fromisoformat(resource['created_at'].replace('Z', '+00:00'))
-        if isinstance(resource.get('updated_at'), str):
-            resource['updated_at'] = datetime.fromisoformat(resource['updated_at'].replace('Z', '+00:00'))
-    
-    return resources
+    body, next_key = current.cached_body((category, city, county, search, after, limit, projection), build)
+    response.headers["X-Dataset-Version"] = str(current.version)
+    if next_key is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_key, current.version if search else None)
+    return json_response(body, response)
+
+@api_router.get("/resources/near", response_model=List[NearbyResource])
+async def get_nearby_resources(
+    response: Response,
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(25.0, gt=0, le=1000),
+    limit: int = Query(20, ge=1, le=200),
+    fields: Optional[str] = Query(None)
+):
+    projection = parse_fields(fields)
+    current = await get_snapshot()
+    response.headers["X-Dataset-Version"] = str(current.version)
+    nearby = current.nearest(lat, lng, radius_km, limit)
+    if projection:
+        return projected_response(NearbyResource, projection + ("distance_km",), nearby, response)
+    return nearby
+
+EXPORT_FIELDS = list(Resource.model_fields)
+# Bookkeeping fields stored on resource documents that are not part of the public record
+EXPORT_EXCLUDED = {"_id": 0, "change_seq": 0, "content_hash": 0}
+EXPORT_BATCH_SIZE = 500
+
+def export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+async def export_ndjson(cursor):
+    async for resource in cursor:
+        yield json.dumps(resource, default=export_value) + "\n"
+
+async def export_csv(cursor, fieldnames: List[str]):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    async for resource in cursor:
+        if "services" in resource:
+            resource["services"] = "; ".join(resource["services"] or [])
+        for field in ("created_at", "updated_at"):
+            if isinstance(resource.get(field), datetime):
+                resource[field] = resource[field].isoformat()
+        writer.writerow(resource)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+@api_router.get("/resources/export")
+async def export_resources(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    fields: Optional[str] = Query(None)
+):
+    """Stream the whole directory straight from Mongo for partner agencies"""
+    projection = parse_fields(fields)
+    fieldnames = list(projection) if projection else EXPORT_FIELDS
+    mongo_projection = {"_id": 0, **{name: 1 for name in projection}} if projection else EXPORT_EXCLUDED
+    cursor = db.resources.find({}, mongo_projection).sort("id", 1).batch_size(EXPORT_BATCH_SIZE)
+    if format == "csv":
+        body, media_type = export_csv(cursor, fieldnames), "text/csv"
+    else:
+        body, media_type = export_ndjson(cursor), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="resources.{format}"'}
+    )
+
+CHANGES_PAGE_SIZE = 500
+
+@api_router.get("/resources/changes")
+async def get_resource_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(CHANGES_PAGE_SIZE, ge=1, le=MAX_RESULTS)
+):
+    """Inserts, updates and deletions after the `since` token, oldest first
+
+    Each change is {"seq", "op": "upsert", "resource"} or {"seq", "op": "delete", "id"}. Pass `next` back as
+    `since` to continue; `has_more` says whether another page is already waiting.
+    """
+    # Capped at the watermark so `next` never passes a change whose write has not committed yet
+    query = {"change_seq": {"$gt": since, "$lte": await committed_change_seq()}}
+    upserted = await db.resources.find(query, {"_id": 0}).sort("change_seq", ASCENDING).limit(limit + 1).to_list(None)
+    deleted = await db.resource_tombstones.find(query, {"_id": 0}).sort("change_seq", ASCENDING).limit(limit + 1).to_list(None)
+
+    changes = [
+        {"seq": doc["change_seq"], "op": "upsert", "resource": Resource.model_validate(doc).model_dump()}
+        for doc in upserted
+    ] + [
+        {"seq": doc["change_seq"], "op": "delete", "id": doc["id"]}
+        for doc in deleted
+    ]
+    changes.sort(key=lambda change: change["seq"])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    body = {"changes": changes, "next": changes[-1]["seq"] if changes else since, "has_more": has_more}
+    return Response(content=encode_json(body), media_type="application/json")
 
 @api_router.get("/resources/{resource_id}", response_model=Resource)
-async def get_resource(resource_id: str):
-    resource = await db.resources.find_one({"id": resource_id}, {"_id": 0})
+async def get_resource(resource_id: str, request: Request, response: Response):
+    current = await get_snapshot()
+    resource = current.by_id.get(resource_id)
     if not resource:
         raise HTTPException(status_code=404, detail="Resource not found")
     
-    if isinstance(resource.get('created_at'), str):
-        resource['created_at'] = datetime.fromisoformat(resource['created_at'].replace('Z', '+00:00'))
-    if isinstance(resource.get('updated_at'), str):
-        resource['updated_at'] = datetime.fromisoformat(resource['updated_at'].replace('Z', '+00:00'))
+    etag = make_etag("resource", current.version, resource_id)
+    not_modified = conditional_response(request, response, etag, RESOURCE_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
     
-    return resource
+    response.headers["X-Dataset-Version"] = str(current.version)
+    return json_response(current.encoded[resource_id], response)
 
 @api_router.post("/resources", response_model=Resource, status_code=201)
 async def create_resource(input_data: ResourceCreate):
     resource_dict = input_data.model_dump()
+    resource_dict['county'] = county_locator.locate(input_data.latitude, input_data.longitude)
     resource_obj = Resource(**resource_dict)
     
     doc = resource_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
-    
-    await db.resources.insert_one(doc)
+    doc['content_hash'] = content_hash(input_data.model_dump())
+    async with reserve_change_seqs(1) as seqs:
+        doc['change_seq'] = seqs[0]
+        await db.resources.insert_one(doc)
+    await publish_resource_change()
     return resource_obj
 
+async def delete_resources(resource_ids: List[str]) -> List[str]:
+    """Remove resources, leaving a tombstone for each so change feed clients learn about the deletions
+
+    Not exposed as a route; for admin tooling and future authenticated endpoints. Returns the ids removed.
+    """
+    cursor = db.resources.find({"id": {"$in": resource_ids}}, {"_id": 0, "id": 1})
+    ids = [doc["id"] async for doc in cursor]
+    if not ids:
+        return []
+    async with reserve_change_seqs(len(ids)) as seqs:
+        await db.resources.delete_many({"id": {"$in": ids}})
+        now = datetime.now(timezone.utc)
+        await db.resource_tombstones.insert_many(
+            [{"id": resource_id, "change_seq": seq, "deleted_at": now} for resource_id, seq in zip(ids, seqs)]
+        )
+    await publish_resource_change()
+    return ids
+
 @api_router.get("/categories")
-async def get_categories():
-    categories = [
-        {"id": "housing", "name": "Housing & Shelter", "icon": "Home"},
-        {"id": "legal", "name": "Legal Aid", "icon": "Scale"},
-        {"id": "employment", "name": "Employment Services", "icon": "Briefcase"},
-        {"id": "healthcare", "name": "Healthcare & Mental Health", "icon": "Heart"},
-        {"id": "education", "name": "Education & Training", "icon": "GraduationCap"},
-        {"id": "food", "name": "Food Assistance", "icon": "Utensils"}
-    ]
-    return categories
+async def get_categories(request: Request, response: Response):
+    not_modified = conditional_response(request, response, CATEGORIES_ETAG, CATEGORY_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+    return CATEGORIES
 
-# ============== CHAT ENDPOINT ==============
+@api_router.get("/snapshot")
+async def get_snapshot_info():
+    """Dataset version served by this worker, to confirm a write has propagated"""
+    current = await get_snapshot()
+    return {
+        "version": current.version,
+        "resource_count": len(current.resources),
+        "loaded_at": current.loaded_at.isoformat(),
+        "worker_pid": os.getpid()
+    }
 
-@api_router.post("/chat", response_model=ChatResponse)
-async def chat_with_ai(request: ChatRequest):
-    if not EMERGENT_LLM_KEY:
-        raise HTTPException(status_code=500, detail="LLM API key not configured")
-    
-    system_message = """You help people find reentry resources in Minnesota.
+@api_router.get("/bootstrap")
+async def get_bootstrap(request: Request, response: Response):
+    """Everything the home page needs in one request: categories, per-category counts and resource cards
+
+    The body is built and gzipped once per dataset version, and sent compressed to clients that accept gzip.
+    """
+    current = await get_snapshot()
+    gzipped = accepts_encoding(request.headers.get("accept-encoding", ""), "gzip")
+    etag = make_etag("bootstrap", current.version, "gzip" if gzipped else "identity")
+    # Set first so caches keep gzip and identity copies apart for 304s too
+    response.headers["Vary"] = "Accept-Encoding"
+    not_modified = conditional_response(request, response, etag, RESOURCE_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+
+    def build():
+        counts = {category["id"]: len(current.by_category.get(category["id"], [])) for category in CATEGORIES}
+        # The same card bytes /resources?fields=card sends, embedded without a decode and re-encode
+        cards = orjson.Fragment(projected_list_adapter(Resource, tuple(FIELD_PRESETS["card"])).dump_json(list(current.resources)))
+        return encode_json({
+            "version": current.version,
+            "categories": CATEGORIES,
+            "counts": {**counts, "total": len(current.resources)},
+            "resources": cards
+        })
+
+    body = current.cached_body(("bootstrap",), build)
+    response.headers["X-Dataset-Version"] = str(current.version)
+    if gzipped:
+        response.headers["Content-Encoding"] = "gzip"
+        body = current.cached_body(("bootstrap", "gzip"), lambda: gzip.compress(body))
+    return json_response(body, response)
+
+# ============== LLM PROVIDERS ==============
+
+class Conversation(ABC):
+    """One chat conversation with a model; providers return these from LlmProvider.conversation"""
+
+    @abstractmethod
+    async def send(self, text: str, context: Optional[str] = None) -> str:
+        """Reply to `text`; `context` is extra system guidance for this turn only and is not kept in history"""
+
+    async def stream(self, text: str, context: Optional[str] = None):
+        """Yield the reply in chunks as it arrives; providers without streaming yield it whole"""
+        yield await self.send(text, context)
+
+class LlmProvider(ABC):
+    """A chat backend, selected with the LLM_PROVIDER env var"""
+    name = ""
+
+    def is_configured(self) -> bool:
+        return True
+
+    @abstractmethod
+    def conversation(self, session_id: str, system_message: str, initial_messages: List[dict]) -> Conversation:
+        """Start a conversation seeded with `initial_messages`"""
+
+class EmergentConversation(Conversation):
+    """Keeps the turns itself and sends them with each turn, so per-turn context never enters the history"""
+
+    def __init__(self, provider: "EmergentProvider", session_id: str, system_message: str, initial_messages: List[dict]):
+        self.provider = provider
+        self.session_id = session_id
+        self.system_message = system_message
+        self.turns = [msg for msg in initial_messages if msg["role"] != "system"]
+
+    def _system_message(self, context: Optional[str]) -> str:
+        return f"{self.system_message}\n\n{context}" if context else self.system_message
+
+    async def send(self, text: str, context: Optional[str] = None) -> str:
+        system_message = self._system_message(context)
+        chat = LlmChat(
+            api_key=self.provider.api_key,
+            session_id=self.session_id,
+            system_message=system_message,
+            initial_messages=[{"role": "system", "content": system_message}] + self.turns
+        ).with_model(self.provider.model_provider, self.provider.model)
+        reply = await chat.send_message(UserMessage(text=text))
+        self.turns += [{"role": "user", "content": text}, {"role": "assistant", "content": reply}]
+        return reply
+
+    async def stream(self, text: str, context: Optional[str] = None):
+        """Yield reply deltas from a streamed litellm completion as the model produces them
+
+        LlmChat only returns whole replies. If the streamed request can't be started, the reply is sent whole
+        through LlmChat instead, so the chat still answers.
+        """
+        messages = [{"role": "system", "content": self._system_message(context)}] + self.turns
+        try:
+            response = await litellm.acompletion(
+                model=f"{self.provider.model_provider}/{self.provider.model}",
+                messages=messages + [{"role": "user", "content": text}],
+                api_key=self.provider.api_key,
+                api_base=LLM_API_BASE,
+                stream=True
+            )
+        except Exception as e:
+            logger.warning(f"Streamed completion unavailable, sending the reply whole: {str(e)}")
+            yield await self.send(text, context)
+            return
+        parts = []
+        async for chunk in response:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+        self.turns += [{"role": "user", "content": text}, {"role": "assistant", "content": "".join(parts)}]
+
+class EmergentProvider(LlmProvider):
+    """The hosted model via emergentintegrations' LlmChat"""
+    name = "emergent"
+
+    def __init__(self):
+        self.api_key = EMERGENT_LLM_KEY
+        self.model_provider = os.environ.get('LLM_MODEL_PROVIDER', 'openai')
+        self.model = os.environ.get('LLM_MODEL', 'gpt-5.2')
+
+    def is_configured(self) -> bool:
+        return bool(self.api_key)
+
+    def conversation(self, session_id: str, system_message: str, initial_messages: List[dict]) -> Conversation:
+        return EmergentConversation(self, session_id, system_message, initial_messages)
+
+STUB_DEFAULT_REPLY = (
+    "A good starting point is the Resources page, it lists housing, legal, employment and other support across "
+    "Minnesota. Would you like options for a specific city?"
+)
+
+def parse_latency(spec: str):
+    """Turn a latency spec into a sampler of seconds
+
+    fixed:MS, uniform:LOW_MS:HIGH_MS, normal:MEAN_MS:STDDEV_MS or exponential:MEAN_MS
+    """
+    kind, *args = spec.split(":")
+    samplers = {
+        "fixed": (1, lambda rng, ms: ms),
+        "uniform": (2, lambda rng, low, high: rng.uniform(low, high)),
+        "normal": (2, lambda rng, mean, stddev: max(rng.gauss(mean, stddev), 0.0)),
+        "exponential": (1, lambda rng, mean: rng.expovariate(1 / mean) if mean else 0.0),
+    }
+    if kind not in samplers:
+        raise ValueError(f"Unknown latency distribution '{kind}'. Use one of: {', '.join(samplers)}")
+    arity, sampler = samplers[kind]
+    if len(args) != arity:
+        raise ValueError(f"Latency spec '{spec}' needs {arity} value(s) after '{kind}:', got {len(args)}")
+    try:
+        values = [float(arg) / 1000 for arg in args]
+    except ValueError:
+        raise ValueError(f"Latency spec '{spec}' has a value that is not a number of milliseconds")
+    if any(value < 0 or math.isnan(value) for value in values):
+        raise ValueError(f"Latency spec '{spec}' has a negative or NaN value")
+    return lambda rng: sampler(rng, *values)
+
+class StubConversation(Conversation):
+    def __init__(self, provider: "StubProvider"):
+        self.provider = provider
+
+    async def send(self, text: str, context: Optional[str] = None) -> str:
+        return "".join([chunk async for chunk in self.stream(text, context)])
+
+    async def stream(self, text: str, context: Optional[str] = None):
+        reply = text if self.provider.reply == "echo" else self.provider.reply
+        await asyncio.sleep(self.provider.first_token_latency(self.provider.rng))
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            if i and self.provider.token_delay:
+                await asyncio.sleep(self.provider.token_delay)
+            yield word if i == len(words) - 1 else word + " "
+
+class StubProvider(LlmProvider):
+    """Offline provider for load tests: canned or echoed replies, streamed word by word after a sampled delay
+
+    LLM_STUB_REPLY is "echo" or the reply text, LLM_STUB_LATENCY a parse_latency spec for time to first token,
+    LLM_STUB_TOKEN_DELAY_MS the pause between words and LLM_STUB_SEED makes the latencies repeatable.
+    """
+    name = "stub"
+
+    def __init__(self):
+        self.reply = os.environ.get('LLM_STUB_REPLY', STUB_DEFAULT_REPLY)
+        self.first_token_latency = parse_latency(os.environ.get('LLM_STUB_LATENCY', 'fixed:300'))
+        self.token_delay = float(os.environ.get('LLM_STUB_TOKEN_DELAY_MS', '0')) / 1000
+        seed = os.environ.get('LLM_STUB_SEED')
+        self.rng = random.Random(int(seed) if seed else None)
+
+    def conversation(self, session_id: str, system_message: str, initial_messages: List[dict]) -> Conversation:
+        return StubConversation(self)
+
+LLM_PROVIDERS = {provider.name: provider for provider in (EmergentProvider, StubProvider)}
+
+if LLM_PROVIDER not in LLM_PROVIDERS:
+    raise ValueError(f"Unknown LLM_PROVIDER '{LLM_PROVIDER}'. Use one of: {', '.join(LLM_PROVIDERS)}")
+llm_provider = LLM_PROVIDERS[LLM_PROVIDER]()
+
+# ============== LLM HTTP POOL ==============
+
+LLM_HTTP_MAX_CONNECTIONS = int(os.environ.get('LLM_HTTP_MAX_CONNECTIONS', '20'))
+LLM_HTTP_MAX_KEEPALIVE = int(os.environ.get('LLM_HTTP_MAX_KEEPALIVE', '10'))
+LLM_HTTP_KEEPALIVE_SECONDS = float(os.environ.get('LLM_HTTP_KEEPALIVE_SECONDS', '60'))
+LLM_HTTP_TIMEOUT_SECONDS = float(os.environ.get('LLM_HTTP_TIMEOUT_SECONDS', '60'))
+
+class CountingTransport(httpx.AsyncHTTPTransport):
+    """Keep-alive transport that counts requests and newly opened connections, so reuse can be reported"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requests = 0
+        self.connections_opened = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        caller_trace = request.extensions.get("trace")
+
+        async def trace(event: str, info: dict):
+            if event == "connection.connect_tcp.started":
+                self.connections_opened += 1
+            if caller_trace is not None:
+                await caller_trace(event, info)
+
+        request.extensions["trace"] = trace
+        return await super().handle_async_request(request)
+
+    def stats(self) -> dict:
+        reused = max(self.requests - self.connections_opened, 0)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "reused": reused,
+            "reuse_rate": round(reused / self.requests, 3) if self.requests else 0.0
+        }
+
+llm_http_client: Optional[httpx.AsyncClient] = None
+llm_http_transport: Optional[CountingTransport] = None
+
+def start_llm_http_client():
+    """One keep-alive pool for every upstream model request in this worker
+
+    LlmChat goes through litellm, which uses litellm.aclient_session for its OpenAI clients when it is set.
+    """
+    global llm_http_client, llm_http_transport
+    llm_http_transport = CountingTransport(
+        limits=httpx.Limits(
+            max_connections=LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_HTTP_KEEPALIVE_SECONDS
+        )
+    )
+    llm_http_client = httpx.AsyncClient(
+        transport=llm_http_transport,
+        timeout=LLM_HTTP_TIMEOUT_SECONDS,
+        follow_redirects=True
+    )
+    litellm.aclient_session = llm_http_client
+
+async def close_llm_http_client():
+    global llm_http_client
+    if llm_http_client is not None:
+        litellm.aclient_session = None
+        await llm_http_client.aclose()
+        llm_http_client = None
+
+def llm_http_stats() -> dict:
+    stats = {
+        "max_connections": LLM_HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": LLM_HTTP_MAX_KEEPALIVE,
+        "keepalive_seconds": LLM_HTTP_KEEPALIVE_SECONDS
+    }
+    if llm_http_transport is not None:
+        stats.update(llm_http_transport.stats())
+    return stats
+
+# ============== CHAT CONTEXT ==============
+
+CHAT_SYSTEM_MESSAGE = """You help people find reentry resources in Minnesota.
 
 Style:
 - Keep responses to 3-4 short sentences max.
@@ -211,32 +1321,461 @@ Approach:
 Example for housing:
 "A good starting point is 180 Degrees, they connect people with housing and support services. Would you like info for a specific part of Minnesota?"
 
+When directory matches are listed below, recommend from those matches by name rather than from memory.
+
 Do not use lists, bullet points, or special characters except commas, periods, and question marks."""
 
+CHAT_HISTORY_TURNS = 10
+
+def build_chat_context(system_message: str, history: List[ChatMessage]) -> List[dict]:
+    """System prompt plus the recent user and assistant turns, sent together with the new message"""
+    messages = [{"role": "system", "content": system_message}]
+    for msg in history[-CHAT_HISTORY_TURNS:]:
+        if msg.role in ("user", "assistant"):
+            messages.append({"role": msg.role, "content": msg.content})
+    return messages
+
+def new_chat(request: ChatRequest) -> Conversation:
+    """A conversation rebuilt from the history the client sends, so no per-session state is kept"""
+    return llm_provider.conversation(
+        request.session_id, CHAT_SYSTEM_MESSAGE, build_chat_context(CHAT_SYSTEM_MESSAGE, request.history)
+    )
+
+# ============== CHAT ANSWER CACHE ==============
+
+ANSWER_CACHE_MAX = int(os.environ.get('ANSWER_CACHE_MAX', '500'))
+ANSWER_CACHE_TTL_SECONDS = float(os.environ.get('ANSWER_CACHE_TTL_SECONDS', '3600'))
+
+QUESTION_STOPWORDS = frozenset("""
+a about am an and any are as at be can could do does find for from get give got have help hi hello how i im
+in is it looking me my need of on or please some somewhere that the there this to want what where which
+who with would you your
+""".split())
+
+def stem(word: str) -> str:
+    for suffix in ("ing", "ed", "es", "ly", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+def normalize_question(message: str) -> str:
+    """Cache key for a question: lowercased, punctuation and stopwords dropped, stemmed, order-independent"""
+    words = {stem(word) for word in tokenize(message) if word not in QUESTION_STOPWORDS}
+    return " ".join(sorted(words))
+
+def is_first_turn(history: List[ChatMessage]) -> bool:
+    return not any(msg.role == "user" for msg in history)
+
+class AnswerCache:
+    """LRU + TTL cache of cleaned first-turn replies, cleared whenever the resource dataset version changes"""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._answers = OrderedDict()  # key -> (reply, stored_at)
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    def _check_version(self, version: int):
+        if version != self._version:
+            self._answers.clear()
+            self._version = version
+
+    def get(self, key: str, version: int) -> Optional[str]:
+        self._check_version(version)
+        entry = self._answers.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+            self._answers.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        if entry is not None:
+            del self._answers[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: str, version: int, reply: str):
+        self._check_version(version)
+        self._answers[key] = (reply, time.monotonic())
+        self._answers.move_to_end(key)
+        while len(self._answers) > self.max_size:
+            self._answers.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._answers),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "dataset_version": self._version
+        }
+
+answer_cache = AnswerCache(ANSWER_CACHE_MAX, ANSWER_CACHE_TTL_SECONDS)
+
+def answer_cache_key(request: ChatRequest) -> Optional[str]:
+    """Only opening questions are cached; later turns depend on the conversation"""
+    if not is_first_turn(request.history):
+        return None
+    return normalize_question(request.message) or None
+
+# ============== CHAT RETRIEVAL ==============
+
+CHAT_CONTEXT_RESOURCES = int(os.environ.get('CHAT_CONTEXT_RESOURCES', '4'))
+RESOURCE_SUMMARY_CHARS = 240
+CATEGORY_MATCH_BONUS = 3.0
+PLACE_MATCH_BONUS = 4.0
+
+CATEGORY_KEYWORDS = {
+    category: {stem(word) for word in words.split()}
+    for category, words in {
+        "housing": "housing house home shelter apartment rent homeless sober halfway transitional",
+        "legal": "legal lawyer attorney court record expungement expunge warrant probation parole license",
+        "employment": "job work employment career hire hiring resume interview",
+        "healthcare": "health healthcare doctor medical clinic mental therapy counseling addiction treatment recovery insurance medicaid",
+        "education": "education school class ged college training degree literacy",
+        "food": "food meal hungry snap groceries grocery pantry eat",
+    }.items()
+}
+
+def mentioned_places(snapshot: ResourceSnapshot, message: str) -> set:
+    """City and county names from the directory that appear in the message"""
+    padded = f" {' '.join(tokenize(message))} "
+    return {place for place in snapshot.place_names if f" {' '.join(tokenize(place))} " in padded}
+
+def retrieve_resources(snapshot: ResourceSnapshot, message: str, limit: int = CHAT_CONTEXT_RESOURCES) -> List[dict]:
+    """Score directory entries against a chat message by text match, category keywords and place mentions"""
+    words = [word for word in tokenize(message) if word not in QUESTION_STOPWORDS]
+    stems = {stem(word) for word in words}
+    categories = {category for category, keywords in CATEGORY_KEYWORDS.items() if stems & keywords}
+    places = mentioned_places(snapshot, message)
+
+    scores = snapshot.search_index.scores(" ".join(words)) if words else {}
+    candidates = {resource_id: snapshot.by_id[resource_id] for resource_id in scores}
+    for category in categories:
+        candidates.update((resource["id"], resource) for resource in snapshot.by_category.get(category, []))
+
+    ranked = []
+    for resource_id, resource in candidates.items():
+        score = scores.get(resource_id, 0.0)
+        if resource["category"] in categories:
+            score += CATEGORY_MATCH_BONUS
+        if resource["city"] in places or resource.get("county") in places:
+            score += PLACE_MATCH_BONUS
+        ranked.append((-score, resource["name"], resource))
+    ranked.sort(key=lambda item: item[:2])
+    return [resource for _, _, resource in ranked[:limit]]
+
+def summarize_resource(resource: dict) -> str:
+    place = resource["city"] + (f", {resource['county']} County" if resource.get("county") else "")
+    detail = resource.get("good_fit_if") or resource["description"].split(". ")[0]
+    contact = "; ".join(filter(None, [resource.get("phone"), resource.get("website")]))
+    summary = f"{resource['name']} ({resource['category']}, {place}). {detail}"
+    if contact:
+        summary += f" Contact: {contact}"
+    return summary[:RESOURCE_SUMMARY_CHARS]
+
+def grounding_context(snapshot: ResourceSnapshot, message: str) -> Optional[str]:
+    """Compact summaries of the directory entries best matching this turn's message, sent as per-turn context"""
+    matches = retrieve_resources(snapshot, message)
+    if not matches:
+        return None
+    lines = "\n".join(f"- {summarize_resource(resource)}" for resource in matches)
+    return f"Directory matches for the latest message:\n{lines}"
+
+# ============== LLM BULKHEAD ==============
+
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', '8'))
+LLM_MAX_QUEUE = int(os.environ.get('LLM_MAX_QUEUE', '32'))
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.environ.get('LLM_QUEUE_TIMEOUT_SECONDS', '10'))
+LLM_RETRY_AFTER_SECONDS = int(os.environ.get('LLM_RETRY_AFTER_SECONDS', '5'))
+
+class BulkheadFull(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__("Chat service is busy, please try again shortly")
+        self.retry_after = retry_after
+
+class Bulkhead:
+    """Caps concurrent upstream LLM calls, with a bounded queue of callers waiting for a slot
+
+    Callers arriving when every slot is busy and the queue is full, or who wait longer than the queue timeout,
+    get BulkheadFull instead of piling more load onto the provider.
+    """
+
+    def __init__(self, max_concurrent: int, max_waiting: int, wait_timeout: float, retry_after: int):
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def is_full(self) -> bool:
+        return self.in_flight + self.waiting >= self.max_concurrent + self.max_waiting
+
+    def reject_if_full(self):
+        if self.is_full():
+            self.rejected += 1
+            raise BulkheadFull(self.retry_after)
+
+    @asynccontextmanager
+    async def slot(self):
+        self.reject_if_full()
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.wait_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise BulkheadFull(self.retry_after)
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - started
+        self.accepted += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_waiting,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "peak_queue_depth": self.peak_waiting,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": round(self._total_wait / self.accepted * 1000, 1) if self.accepted else 0.0,
+            "max_wait_ms": round(self._max_wait * 1000, 1)
+        }
+
+llm_bulkhead = Bulkhead(LLM_MAX_CONCURRENCY, LLM_MAX_QUEUE, LLM_QUEUE_TIMEOUT_SECONDS, LLM_RETRY_AFTER_SECONDS)
+
+def service_busy(error: BulkheadFull) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(error), headers={"Retry-After": str(error.retry_after)})
+
+# ============== CHAT ENDPOINT ==============
+
+# Replies may only contain letters, numbers, whitespace, and _ , . ?
+DISALLOWED_REPLY_CHARS = re.compile(r'[^a-zA-Z0-9\s_,.\?]')
+
+class ReplyCleaner:
+    """Applies the reply character whitelist chunk by chunk
+
+    The whitelist is per character, so cleaning each chunk is exact. Whitespace is held back until more text
+    follows, which makes the concatenated output equal to cleaning and stripping the whole reply at once.
+    """
+
+    def __init__(self):
+        self._started = False
+        self._pending_space = ""
+
+    def feed(self, chunk: str) -> str:
+        text = DISALLOWED_REPLY_CHARS.sub('', chunk)
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self._started = True
+        body = text.rstrip()
+        if not body:
+            self._pending_space += text
+            return ""
+        out = self._pending_space + body
+        self._pending_space = text[len(body):]
+        return out
+
+def clean_reply(text: str) -> str:
+    return ReplyCleaner().feed(text)
+
+CHAT_DEADLINE_SECONDS = float(os.environ.get('CHAT_DEADLINE_SECONDS', '20'))
+FALLBACK_RESOURCES = 3
+
+# Marks the end of a reply on a stream_turn queue
+END_OF_REPLY = object()
+
+async def stream_turn(chat: Conversation, message: str, context: Optional[str], queue: asyncio.Queue):
+    """Run one upstream turn under a bulkhead slot, handing raw chunks to `queue`
+
+    Runs as its own task so the slot is released as soon as the model finishes, however slowly the client
+    reads, and so the reader can cancel it (slot wait included) when the deadline passes.
+    Errors are put on the queue for the reader to raise.
+    """
     try:
-        chat = LlmChat(
-            api_key=EMERGENT_LLM_KEY,
-            session_id=request.session_id,
-            system_message=system_message
-        ).with_model("openai", "gpt-5.2")
-        
-        for msg in request.history[-10:]:
-            if msg.role == "user":
-                await chat.send_message(UserMessage(text=msg.content))
-        
-        user_message = UserMessage(text=request.message)
-        response = await chat.send_message(user_message)
-        
-        # Clean response - only allow letters, numbers, spaces, and _ , . ?
-        import re
-        cleaned = re.sub(r'[^a-zA-Z0-9\s_,.\?]', '', response)
-        
-        return ChatResponse(response=cleaned.strip(), session_id=request.session_id)
+        async with llm_bulkhead.slot():
+            async for chunk in chat.stream(message, context):
+                queue.put_nowait(chunk)
+    except Exception as e:
+        queue.put_nowait(e)
+        return
+    queue.put_nowait(END_OF_REPLY)
+
+def fallback_reply(snapshot: ResourceSnapshot, message: str) -> str:
+    """Deterministic answer built from the directory, used when the model misses the chat deadline"""
+    matches = retrieve_resources(snapshot, message, limit=FALLBACK_RESOURCES)
+    if not matches:
+        text = ("I could not put together a full answer just now. You can browse housing, legal, employment, "
+                "healthcare, education and food resources on the Resources page, or ask me again in a moment.")
+        return clean_reply(text)
+
+    categories = list(dict.fromkeys(resource["category"] for resource in matches))
+    if len(categories) > 1:
+        categories = [", ".join(categories[:-1]) + " and " + categories[-1]]
+    sentences = [f"I could not put together a full answer just now, but these {categories[0]} resources look like a good fit."]
+    for resource in matches:
+        sentence = f"{resource['name']} in {resource['city']}"
+        if resource.get("phone"):
+            sentence += ", phone " + " ".join(re.findall(r'\d+', resource["phone"]))
+        sentences.append(sentence.rstrip(".") + ".")
+    sentences.append("Ask me again in a moment if you want more detail.")
+    return re.sub(r'\s+', ' ', clean_reply(" ".join(sentences)))
+
+@api_router.post("/chat", response_model=ChatResponse)
+async def chat_with_ai(request: ChatRequest):
+    if not llm_provider.is_configured():
+        raise HTTPException(status_code=500, detail="LLM API key not configured")
+
+    cache_key = answer_cache_key(request)
+    current = await get_snapshot()
+    version = current.version
+    if cache_key:
+        cached = answer_cache.get(cache_key, version)
+        if cached is not None:
+            return ChatResponse(response=cached, session_id=request.session_id)
+
+    chat = new_chat(request)
+
+    async def converse() -> str:
+        # Prior turns travel as context, so this is the only upstream request
+        context = grounding_context(current, request.message)
+        async with llm_bulkhead.slot():
+            response = await chat.send(request.message, context)
+        return clean_reply(response)
+
+    try:
+        cleaned = await asyncio.wait_for(converse(), CHAT_DEADLINE_SECONDS)
+        if cache_key and cleaned:
+            answer_cache.put(cache_key, version, cleaned)
+        return ChatResponse(response=cleaned, session_id=request.session_id)
     
+    except asyncio.TimeoutError:
+        logger.warning(f"Chat deadline of {CHAT_DEADLINE_SECONDS}s exceeded, answering from the directory")
+        return ChatResponse(response=fallback_reply(current, request.message), session_id=request.session_id)
+    except BulkheadFull as e:
+        raise service_busy(e)
     except Exception as e:
         logger.error(f"Chat error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Chat service error: {str(e)}")
 
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@api_router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Same as /chat, but sends the cleaned reply as Server-Sent Events while it is generated
+
+    Emits `token` events with {"text"}, then one `done` event with the full response, or an `error` event.
+    """
+    if not llm_provider.is_configured():
+        raise HTTPException(status_code=500, detail="LLM API key not configured")
+
+    cache_key = answer_cache_key(request)
+    current = await get_snapshot()
+    version = current.version
+    cached = answer_cache.get(cache_key, version) if cache_key else None
+    if cached is not None:
+        async def cached_events():
+            yield sse_event("token", {"text": cached})
+            yield sse_event("done", {"response": cached, "session_id": request.session_id})
+        return StreamingResponse(
+            cached_events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    try:
+        llm_bulkhead.reject_if_full()
+    except BulkheadFull as e:
+        raise service_busy(e)
+
+    chat = new_chat(request)
+    deadline = time.monotonic() + CHAT_DEADLINE_SECONDS
+
+    async def events():
+        cleaner = ReplyCleaner()
+        parts = []
+        queue = asyncio.Queue()
+        turn = asyncio.create_task(stream_turn(chat, request.message, grounding_context(current, request.message), queue))
+        try:
+            while True:
+                # Bounds waiting for a bulkhead slot as well as the reply itself
+                item = await asyncio.wait_for(queue.get(), max(deadline - time.monotonic(), 0))
+                if item is END_OF_REPLY:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                text = cleaner.feed(item)
+                if text:
+                    parts.append(text)
+                    yield sse_event("token", {"text": text})
+            cleaned = "".join(parts)
+            if cache_key and cleaned:
+                answer_cache.put(cache_key, version, cleaned)
+            yield sse_event("done", {"response": cleaned, "session_id": request.session_id})
+        except asyncio.TimeoutError:
+            logger.warning(f"Chat stream deadline of {CHAT_DEADLINE_SECONDS}s exceeded")
+            if parts:
+                cleaned = "".join(parts)
+            else:
+                cleaned = fallback_reply(current, request.message)
+                yield sse_event("token", {"text": cleaned})
+            yield sse_event("done", {"response": cleaned, "session_id": request.session_id})
+        except BulkheadFull as e:
+            yield sse_event("error", {"detail": str(e), "retry_after": e.retry_after})
+        except Exception as e:
+            logger.error(f"Chat stream error: {str(e)}")
+            yield sse_event("error", {"detail": f"Chat service error: {str(e)}"})
+        finally:
+            # Cancels the upstream call after a timeout or client disconnect; a no-op once it has finished
+            turn.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ============== METRICS ENDPOINT ==============
+
+@api_router.get("/metrics")
+async def get_metrics():
+    """In-process counters for this worker"""
+    return {
+        "worker_pid": os.getpid(),
+        "llm_provider": llm_provider.name,
+        "chat_answer_cache": answer_cache.stats(),
+        "llm_bulkhead": llm_bulkhead.stats(),
+        "llm_http_pool": llm_http_stats()
+    }
+
 # ============== RESOURCE SUBMISSION ENDPOINT ==============
 
 @api_router.post("/submissions", status_code=201)
@@ -255,7 +1794,7 @@ async def submit_resource(submission: ResourceSubmission):
         "services": submission.services,
         "submitter_email": submission.submitterEmail,
         "status": "pending",
-        "submitted_at": datetime.now(timezone.utc).isoformat()
+        "submitted_at": datetime.now(timezone.utc)
     }
     
     await db.submissions.insert_one(doc)
@@ -265,1721 +1804,137 @@ async def submit_resource(submission: ResourceSubmission):
 @api_router.get("/submissions")
 async def get_submissions():
     """Get all pending submissions (for admin review)"""
-    submissions = await db.submissions.find({}, {"_id": 0}).to_list(100)
+    submissions = await db.submissions.find({"status": "pending"}, {"_id": 0}).sort("submitted_at", DESCENDING).to_list(100)
     return submissions
 
 # ============== SEED DATA ENDPOINT ==============
 
+SEED_RESOURCES_FILE = ROOT_DIR / 'data' / 'seed_resources.json'
+# Seed entries are matched to stored resources on this natural key, so re-seeding updates rather than duplicates
+# Includes the street address, since branches of one organisation often share a name within a city
+SEED_KEY_FIELDS = ("name", "city", "address", "zip_code")
+
+SEED_LOCK_TTL_SECONDS = 300
+# Identifies this worker as the holder of a Mongo lock document
+WORKER_ID = str(uuid.uuid4())
+# Set once this worker has seen the current seed data in Mongo, so /api/seed never needs to look again
+_seeded = False
+
+@lru_cache(maxsize=1)
+def seed_file_hash() -> str:
+    return hashlib.sha256(SEED_RESOURCES_FILE.read_bytes()).hexdigest()
+
+@lru_cache(maxsize=1)
+def load_seed_resources() -> Tuple[dict, ...]:
+    """The bundled Minnesota reentry resources, read from disk on first use"""
+    with open(SEED_RESOURCES_FILE, encoding="utf-8") as f:
+        return tuple(json.load(f))
+
+def content_hash(resource: dict) -> str:
+    """Digest of a ResourceCreate dump, stored on each resource so rewriting identical content can be skipped"""
+    return hashlib.sha256(orjson.dumps(resource, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+def natural_key(resource: dict) -> tuple:
+    return tuple(resource[field] for field in SEED_KEY_FIELDS)
+
+def classify_resource(resource: dict, existing: Dict[tuple, Optional[str]]) -> Tuple[str, str]:
+    """("new", "changed" or "unchanged", content hash) for a validated resource against stored_content_hashes()"""
+    digest = content_hash(resource)
+    key = natural_key(resource)
+    if key not in existing:
+        return "new", digest
+    return ("unchanged" if existing[key] == digest else "changed"), digest
+
+async def stored_content_hashes() -> Dict[tuple, Optional[str]]:
+    """content_hash of every stored resource by natural key; None for resources written before hashes existed"""
+    projection = {"_id": 0, "content_hash": 1, **{field: 1 for field in SEED_KEY_FIELDS}}
+    return {natural_key(doc): doc.get("content_hash") async for doc in db.resources.find({}, projection)}
+
+def resource_upserts(changes: List[Tuple[dict, str]], now: datetime, seqs: range) -> List[UpdateOne]:
+    """Upsert each new or changed (resource, content hash) by its natural key
+
+    Only called with resources whose content differs, so updated_at and change_seq move only on real changes.
+    id and created_at are only written when the resource is new.
+    """
+    return [
+        UpdateOne(
+            dict(zip(SEED_KEY_FIELDS, natural_key(resource))),
+            {
+                "$set": {
+                    **resource,
+                    "county": county_locator.locate(resource["latitude"], resource["longitude"]),
+                    "content_hash": digest,
+                    "change_seq": seq,
+                    "updated_at": now
+                },
+                "$setOnInsert": {"id": str(uuid.uuid4()), "created_at": now}
+            },
+            upsert=True
+        )
+        for (resource, digest), seq in zip(changes, seqs)
+    ]
+
+async def acquire_lock(name: str, ttl_seconds: float) -> bool:
+    """Take a Mongo lock document for this worker; expired locks from crashed workers are taken over"""
+    now = datetime.now(timezone.utc)
+    try:
+        await db.locks.find_one_and_update(
+            {"_id": name, "$or": [{"expires_at": {"$lt": now}}, {"owner": WORKER_ID}]},
+            {"$set": {"owner": WORKER_ID, "expires_at": now + timedelta(seconds=ttl_seconds)}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        # Another worker holds an unexpired lock, so the upsert collided with its document
+        return False
+
+async def release_lock(name: str):
+    await db.locks.delete_one({"_id": name, "owner": WORKER_ID})
+
+async def ensure_seeded() -> bool:
+    """Write the seed data once per seed file version, under a lock so concurrent workers don't race
+
+    Returns whether the current seed data is in place. False means another worker is seeding right now.
+    """
+    global _seeded
+    if _seeded:
+        return True
+
+    seed_hash = seed_file_hash()
+    if await db.meta.find_one({"_id": "seed", "hash": seed_hash}):
+        _seeded = True
+        return True
+    if not await acquire_lock("seed", SEED_LOCK_TTL_SECONDS):
+        logger.info("Seed lock is held by another worker, skipping seeding")
+        return False
+
+    try:
+        # Re-check under the lock in case another worker finished seeding just before we took it
+        if not await db.meta.find_one({"_id": "seed", "hash": seed_hash}):
+            resources = [ResourceCreate.model_validate(entry).model_dump() for entry in load_seed_resources()]
+            existing = await stored_content_hashes()
+            classified = [(resource, *classify_resource(resource, existing)) for resource in resources]
+            changes = [(resource, digest) for resource, status, digest in classified if status != "unchanged"]
+            now = datetime.now(timezone.utc)
+            if changes:
+                async with reserve_change_seqs(len(changes)) as seqs:
+                    await db.resources.bulk_write(resource_upserts(changes, now, seqs), ordered=False)
+            await db.meta.update_one({"_id": "seed"}, {"$set": {"hash": seed_hash, "seeded_at": now}}, upsert=True)
+            added = sum(1 for _, status, _ in classified if status == "new")
+            logger.info(f"Seeded {len(resources)} resources ({added} added, {len(changes) - added} updated)")
+            if changes:
+                await publish_resource_change()
+        _seeded = True
+        return True
+    finally:
+        await release_lock("seed")
+
 @api_router.post("/seed")
 async def seed_database():
-    """Seed the database with Minnesota reentry resources"""
-    
-    # Check if already seeded
-    count = await db.resources.count_documents({})
-    if count > 0:
-        return {"message": f"Database already has {count} resources"}
-    
-    resources = [
-        # ============== HOUSING ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "180 Degrees",
-            "category": "housing",
-            "description": "Structured 60-day transitional housing at three Minneapolis locations. Bundled with mandatory employment assistance through SONIC program and case management. Residents must maintain sobriety and actively seek work and permanent housing.",
-            "address": "236 Clifton Ave S",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55403",
-            "phone": "(612) 813-5050",
-            "website": "https://180degrees.org",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["Transitional Housing", "Case Management", "Employment Support", "SONIC Job Program", "RECONNECT Pre-Release"],
-            "latitude": 44.9728,
-            "longitude": -93.2219,
-            "serving_area": "Hennepin County",
-            "good_fit_if": "You want structured transitional housing with built-in job search support and accountability.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "RS EDEN Community Reentry",
-            "category": "housing",
-            "description": "Two St. Paul halfway houses with 24/7 supervision. Combines structured residential treatment with substance use counseling, mental health services, and discharge planning. Daily programming required.",
-            "address": "1931 W Broadway Ave",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55411",
-            "phone": "(612) 782-2994",
-            "website": "https://rseden.org",
-            "hours": "24/7",
-            "services": ["Halfway House", "Substance Use Treatment", "Mental Health Services", "Discharge Planning", "Recovery Support"],
-            "latitude": 44.9996,
-            "longitude": -93.3044,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You need structured halfway house living with integrated recovery and mental health support.",
-            "reentry_focused": True,
-            "cost": "Often covered by referral agency",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Volunteers of America - Roseville Reentry Center",
-            "category": "housing",
-            "description": "58-bed federal residential reentry center for men and women completing sentences in the community. Highly structured with daily schedules, curfews, and required programming. Includes job readiness and case management.",
-            "address": "2445 Prior Ave N",
-            "city": "Roseville",
-            "state": "MN",
-            "zip_code": "55113",
-            "phone": "(651) 287-2100",
-            "website": "https://voamnwi.org/residential-reentry-centers",
-            "hours": "24/7",
-            "services": ["Residential Reentry", "Job Readiness Training", "Case Management", "Transportation Assistance"],
-            "latitude": 45.0178,
-            "longitude": -93.1549,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You have a federal referral and need structured housing while completing your sentence in the community.",
-            "reentry_focused": True,
-            "cost": "No cost to participants",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Catholic Charities Dorothy Day Center",
-            "category": "housing",
-            "description": "Same-day emergency shelter beds in downtown Minneapolis plus long-term supportive housing options. Self-directed shelter access with optional case management and housing navigation services.",
-            "address": "1200 2nd Ave S",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55403",
-            "phone": "(612) 204-8500",
-            "website": "https://cctwincities.org",
-            "hours": "24/7 Shelter",
-            "services": ["Emergency Shelter", "Supportive Housing", "Case Management", "Housing Navigation"],
-            "latitude": 44.9692,
-            "longitude": -93.2750,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You need immediate shelter tonight or help navigating into stable housing.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Hearth Connection",
-            "category": "housing",
-            "description": "Housing First approach prioritizing rapid placement into permanent housing. Self-directed program with voluntary case management. Focuses on housing stability without requiring sobriety or program completion first.",
-            "address": "2446 University Ave W, Suite 150",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55114",
-            "phone": "(651) 645-0676",
-            "website": "https://hearthconnection.org",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["Housing First", "Rapid Rehousing", "Housing Stability", "Voluntary Case Management"],
-            "latitude": 44.9659,
-            "longitude": -93.1970,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You want help getting into permanent housing quickly without program requirements.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Simpson Housing Services",
-            "category": "housing",
-            "description": "Emergency overnight shelter plus street outreach in Minneapolis. Low-barrier access with meals and basic needs. Optional supportive housing programs available for longer-term stability.",
-            "address": "2100 Pillsbury Ave S",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55404",
-            "phone": "(612) 874-8683",
-            "website": "https://simpsonhousing.org",
-            "hours": "24/7 Shelter",
-            "services": ["Emergency Shelter", "Street Outreach", "Meals", "Supportive Housing"],
-            "latitude": 44.9554,
-            "longitude": -93.2778,
-            "serving_area": "Minneapolis",
-            "good_fit_if": "You need a safe place to sleep tonight with no questions asked.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== LEGAL AID ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Legal Rights Center",
-            "category": "legal",
-            "description": "Free criminal defense for adults and juveniles plus Know Your Rights community workshops. Handles active cases only, not expungement. Also runs youth diversion programs through restorative justice partnerships.",
-            "address": "1611 Park Ave S",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55404",
-            "phone": "(612) 337-0030",
-            "website": "https://legalrightscenter.org",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["Criminal Defense", "Juvenile Defense", "Restorative Justice", "Know Your Rights Training"],
-            "latitude": 44.9574,
-            "longitude": -93.2696,
-            "serving_area": "Hennepin County",
-            "good_fit_if": "You need a public defender for an active criminal case or want to attend a Know Your Rights workshop.",
-            "reentry_focused": True,
-            "cost": "Free for qualifying individuals",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Mid-Minnesota Legal Aid - Expungement",
-            "category": "legal",
-            "description": "Free expungement assistance through main office and community clinics at American Indian Center, African Community Services, and Division of Indian Work. Walk-ins welcome at clinics; appointments preferred at main office.",
-            "address": "111 N 5th St, Suite 100",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55403",
-            "phone": "(612) 334-5970",
-            "website": "https://mylegalaid.org",
-            "hours": "Mon-Thu 8:30am-4:30pm, Fri 8:30am-12pm",
-            "services": ["Expungement", "Record Sealing", "Civil Legal Aid", "Community Clinics"],
-            "latitude": 44.9830,
-            "longitude": -93.2697,
-            "serving_area": "Central Minnesota",
-            "good_fit_if": "You want help sealing or clearing your criminal record.",
-            "reentry_focused": True,
-            "cost": "Free for qualifying individuals",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Volunteer Lawyers Network - Expungement Clinics",
-            "category": "legal",
-            "description": "Walk-in expungement clinics plus telephone advice line. Volunteer attorneys handle record clearing, family law, housing disputes. No appointment needed for clinics.",
-            "address": "600 Nicollet Mall, Suite 390A",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55402",
-            "phone": "(612) 752-6677",
-            "website": "https://vlnmn.org",
-            "hours": "Mon-Fri 9am-4pm",
-            "services": ["Expungement Clinics", "Telephone Legal Advice", "Family Law", "Housing Issues"],
-            "latitude": 44.9778,
-            "longitude": -93.2712,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You want to attend a free walk-in legal clinic for expungement or other civil matters.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Minnesota Attorney General - Expungement Program",
-            "category": "legal",
-            "description": "Statewide expungement assistance through HelpSealMyRecord.org. Online screening tool determines eligibility. Provides guidance through the court filing process.",
-            "address": "445 Minnesota St, Suite 1400",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55101",
-            "phone": "(651) 296-3353",
-            "website": "https://www.ag.state.mn.us/Consumer/Publications/Expungement.asp",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["Expungement Screening", "Record Sealing", "Court Filing Guidance"],
-            "latitude": 44.9446,
-            "longitude": -93.0942,
-            "serving_area": "Statewide",
-            "good_fit_if": "You want to check expungement eligibility online and get guidance filing paperwork yourself.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Southern Minnesota Regional Legal Services",
-            "category": "legal",
-            "description": "Free civil legal help for southern Minnesota including expungement, housing disputes, and public benefits. Handles cases from Rochester to the Iowa border.",
-            "address": "903 W Center St, Suite 230",
-            "city": "Rochester",
-            "state": "MN",
-            "zip_code": "55902",
-            "phone": "(507) 292-0080",
-            "website": "https://smrls.org",
-            "hours": "Mon-Fri 8:30am-4:30pm",
-            "services": ["Expungement", "Housing Law", "Public Benefits", "Civil Legal Aid"],
-            "latitude": 44.0218,
-            "longitude": -92.4670,
-            "serving_area": "Southern Minnesota",
-            "good_fit_if": "You live in southern Minnesota and need civil legal help including record clearing.",
-            "reentry_focused": False,
-            "cost": "Free for qualifying individuals",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== EMPLOYMENT ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "HIRED",
-            "category": "employment",
-            "description": "Self-directed job search support including resume workshops, interview prep, and job fairs. Short-term Career Pathways training in healthcare, manufacturing, and customer service. Drop-in resources plus one-on-one counseling available.",
-            "address": "1200 Plymouth Ave N",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55411",
-            "phone": "(612) 529-3342",
-            "website": "https://hired.org",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["Resume Workshops", "Interview Prep", "Career Pathways Training", "Job Fairs", "Career Counseling"],
-            "latitude": 44.9978,
-            "longitude": -93.2944,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You want job search help and short-term training to get hired quickly.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Twin Cities RISE!",
-            "category": "employment",
-            "description": "Intensive 8-week career training combining professional skills with personal empowerment and emotional intelligence. Includes 10-week paid internships after completion. Graduates average $44K salary vs $16K pre-program.",
-            "address": "1301 Bryant Ave N",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55411",
-            "phone": "(612) 338-0295",
-            "website": "https://twincitiesrise.org",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["8-Week Career Training", "Personal Empowerment", "Paid Internships", "Job Placement", "Retention Support"],
-            "latitude": 44.9876,
-            "longitude": -93.2734,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You want intensive career training with personal development and a pathway to a living-wage job.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "EMERGE Minnesota - RESTORE Program",
-            "category": "employment",
-            "description": "Employment program specifically for people with criminal histories. Combines career coaching, job training, and transitional employment. Also offers ProPEL pre-release services and trauma recovery groups.",
-            "address": "1834 Emerson Ave N",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55411",
-            "phone": "(612) 529-9267",
-            "website": "https://emerge-mn.org",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["RESTORE Employment Program", "Career Coaching", "Transitional Jobs", "ProPEL Pre-Release", "Trauma Recovery"],
-            "latitude": 44.9992,
-            "longitude": -93.2950,
-            "serving_area": "Minneapolis",
-            "good_fit_if": "You have a criminal history and want targeted employment support from reentry specialists.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Amicus Reconnect (VOA)",
-            "category": "employment",
-            "description": "One-to-one volunteer mentoring for people leaving incarceration. Long-term relationships lasting months to years. Drop-in center with job search resources, housing referrals, and Will's Fund scholarships for education.",
-            "address": "2822 Lyndale Ave S",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55408",
-            "phone": "(612) 870-7655",
-            "website": "https://voamnwi.org/amicus-reconnect-services",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["One-to-One Mentoring", "Drop-In Center", "Job Search Support", "Education Scholarships", "Housing Referrals"],
-            "latitude": 44.9469,
-            "longitude": -93.2878,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You want ongoing personal support from a volunteer mentor as you rebuild your life.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Minnesota CareerForce",
-            "category": "employment",
-            "description": "State workforce centers with self-service job boards, computers, and printers. Staff available for resume reviews and career counseling by appointment. Connects to unemployment insurance and training grants.",
-            "address": "332 Minnesota St, Suite E200",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55101",
-            "phone": "(651) 259-7114",
-            "website": "https://mn.gov/deed/job-seekers/workforce-centers/",
-            "hours": "Mon-Fri 8am-4:30pm",
-            "services": ["Job Search Computers", "Resume Help", "Career Counseling", "Training Grants", "Unemployment Insurance"],
-            "latitude": 44.9446,
-            "longitude": -93.0942,
-            "serving_area": "Statewide",
-            "good_fit_if": "You want free access to job search tools and staff support at your own pace.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Goodwill-Easter Seals Minnesota",
-            "category": "employment",
-            "description": "Career services combining job search support with financial coaching and digital skills classes. Multiple Twin Cities locations plus retail stores that provide transitional employment opportunities.",
-            "address": "553 Fairview Ave N",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55104",
-            "phone": "(651) 379-5800",
-            "website": "https://goodwilleasterseals.org",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["Job Search Support", "Financial Coaching", "Digital Skills Training", "Transitional Employment"],
-            "latitude": 44.9608,
-            "longitude": -93.1412,
-            "serving_area": "Statewide",
-            "good_fit_if": "You want career help bundled with money management skills and computer training.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "T.O.N.E. U.P.",
-            "category": "employment",
-            "description": "Reentry organization run by formerly incarcerated leaders. Offers employment support, Clean Slate Act navigation for expungement, housing connections, and leadership programs including Liberation of Leaders Fellowship.",
-            "address": "Minneapolis",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55411",
-            "phone": "(612) 326-4900",
-            "website": "https://toneup.org",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["Employment Support", "Clean Slate Navigation", "Housing Connections", "Leadership Programs", "Mental Health Support"],
-            "latitude": 44.9778,
-            "longitude": -93.2712,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You want support from people who have been through reentry themselves.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== HEALTHCARE ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "People Incorporated",
-            "category": "healthcare",
-            "description": "Full-spectrum mental health services from crisis intervention to ongoing therapy. Includes housing support programs for people with mental health needs. Self-referral accepted; sliding scale fees.",
-            "address": "2500 Chicago Ave",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55404",
-            "phone": "(651) 774-0011",
-            "website": "https://peopleincorporated.org",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["Mental Health Therapy", "Crisis Services", "Housing Support", "Psychiatric Services"],
-            "latitude": 44.9534,
-            "longitude": -93.2622,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You need mental health support from therapy to crisis care with housing assistance available.",
-            "reentry_focused": False,
-            "cost": "Sliding scale, insurance accepted",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Hennepin Healthcare",
-            "category": "healthcare",
-            "description": "County hospital with 24/7 emergency services plus primary care clinics. Integrated behavioral health and substance use treatment. Financial assistance available regardless of insurance status.",
-            "address": "701 Park Ave",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55415",
-            "phone": "(612) 873-3000",
-            "website": "https://hennepinhealthcare.org",
-            "hours": "24/7 Emergency; Clinics vary",
-            "services": ["Emergency Care", "Primary Care", "Mental Health", "Substance Use Treatment", "Financial Assistance"],
-            "latitude": 44.9725,
-            "longitude": -93.2611,
-            "serving_area": "Hennepin County",
-            "good_fit_if": "You need medical care and may not have insurance or ability to pay.",
-            "reentry_focused": False,
-            "cost": "Financial assistance available",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "NorthPoint Health & Wellness",
-            "category": "healthcare",
-            "description": "Community health center in North Minneapolis offering medical, dental, and mental health under one roof. Income-based sliding scale with same-day appointments often available. Walk-ins welcome.",
-            "address": "1313 Penn Ave N",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55411",
-            "phone": "(612) 543-2500",
-            "website": "https://northpointhealth.org",
-            "hours": "Mon-Fri 8am-5pm, Sat 8am-12pm",
-            "services": ["Primary Care", "Dental Care", "Mental Health", "Walk-In Clinic"],
-            "latitude": 44.9958,
-            "longitude": -93.2936,
-            "serving_area": "North Minneapolis",
-            "good_fit_if": "You want medical, dental, and mental health care at one location with affordable pricing.",
-            "reentry_focused": False,
-            "cost": "Sliding scale based on income",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Hazelden Betty Ford - Center City",
-            "category": "healthcare",
-            "description": "Residential addiction treatment ranging from 28-day programs to extended care. Structured recovery environment with individual and group therapy, family programs, and alumni support network.",
-            "address": "15251 Pleasant Valley Rd",
-            "city": "Center City",
-            "state": "MN",
-            "zip_code": "55012",
-            "phone": "(800) 257-7810",
-            "website": "https://hazeldenbettyford.org",
-            "hours": "24/7",
-            "services": ["Inpatient Treatment", "Extended Care", "Family Programs", "Alumni Support", "Continuing Care"],
-            "latitude": 45.3969,
-            "longitude": -92.8168,
-            "serving_area": "Statewide",
-            "good_fit_if": "You want intensive residential addiction treatment with long-term recovery support.",
-            "reentry_focused": False,
-            "cost": "Insurance accepted, financial assistance available",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "EMERGE Trauma Recovery Groups",
-            "category": "healthcare",
-            "description": "Group therapy specifically designed for people in reentry dealing with trauma from incarceration. Peer-informed approach led by trained facilitators. Part of EMERGE's bundled reentry services.",
-            "address": "1834 Emerson Ave N",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55411",
-            "phone": "(612) 529-9267",
-            "website": "https://emerge-mn.org/reentry-services",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["Trauma Recovery Groups", "Peer Support", "Reentry Counseling"],
-            "latitude": 44.9992,
-            "longitude": -93.2950,
-            "serving_area": "Minneapolis",
-            "good_fit_if": "You want group support for processing trauma from incarceration with others who understand.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== EDUCATION ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Summit Academy OIC",
-            "category": "education",
-            "description": "Free 20-week construction training (carpentry, framing, roofing) plus 10-week GED program. Structured Monday-Friday schedule with classroom and hands-on shop work. Graduates earn $43K+ average in union or entry-level positions.",
-            "address": "935 Olson Memorial Hwy",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55405",
-            "phone": "(612) 377-0150",
-            "website": "https://saoic.org",
-            "hours": "Mon-Fri 8:30am-2:50pm",
-            "services": ["Construction Training", "GED Preparation", "Job Placement", "Career Certifications"],
-            "latitude": 44.9830,
-            "longitude": -93.2920,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You want free hands-on construction training or need to get your GED.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Minneapolis Adult Education",
-            "category": "education",
-            "description": "Free GED prep, basic skills, and English language classes with flexible day and evening schedules. Self-paced learning with instructor support. Career pathway counseling included.",
-            "address": "3225 Bloomington Ave",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55407",
-            "phone": "(612) 668-3800",
-            "website": "https://mae.mpls.k12.mn.us",
-            "hours": "Mon-Thu 8am-8pm, Fri 8am-4pm",
-            "services": ["GED Preparation", "Basic Skills", "English Classes", "Career Pathways"],
-            "latitude": 44.9384,
-            "longitude": -93.2476,
-            "serving_area": "Minneapolis",
-            "good_fit_if": "You want flexible GED or skills classes you can fit around work or other responsibilities.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Saint Paul College",
-            "category": "education",
-            "description": "Community college with support services for students with barriers. Offers certificates, diplomas, and associate degrees. Financial aid office helps navigate grants and loans. Student support includes tutoring and advising.",
-            "address": "235 Marshall Ave",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55102",
-            "phone": "(651) 846-1600",
-            "website": "https://saintpaul.edu",
-            "hours": "Mon-Fri 7:30am-6pm",
-            "services": ["Associate Degrees", "Certificates", "Financial Aid", "Student Support Services", "Tutoring"],
-            "latitude": 44.9448,
-            "longitude": -93.1052,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You want to earn a college credential with support services to help you succeed.",
-            "reentry_focused": False,
-            "cost": "Financial aid available",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Literacy Minnesota",
-            "category": "education",
-            "description": "One-on-one tutoring and small group classes for reading, writing, and digital skills. Volunteer tutors matched to learners. Flexible scheduling at community locations across the metro.",
-            "address": "700 Raymond Ave, Suite 180",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55114",
-            "phone": "(651) 251-9110",
-            "website": "https://literacymn.org",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["Adult Literacy", "One-on-One Tutoring", "Digital Skills", "English Classes"],
-            "latitude": 44.9630,
-            "longitude": -93.1950,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You want personalized help improving reading, writing, or computer skills.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== FOOD ASSISTANCE ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Second Harvest Heartland",
-            "category": "food",
-            "description": "Food bank network with online food shelf locator covering all of Minnesota. Use website to find nearest pantry by zip code. Also provides SNAP application assistance through partner agencies.",
-            "address": "7101 Winnetka Ave N",
-            "city": "Brooklyn Park",
-            "state": "MN",
-            "zip_code": "55428",
-            "phone": "(866) 844-3663",
-            "website": "https://2harvest.org/find-food",
-            "hours": "Mon-Fri 8am-4:30pm",
-            "services": ["Food Shelf Locator", "SNAP Assistance", "Partner Food Pantries"],
-            "latitude": 45.0913,
-            "longitude": -93.3684,
-            "serving_area": "Statewide",
-            "good_fit_if": "You need to find a food shelf near you or want help applying for SNAP.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Loaves and Fishes",
-            "category": "food",
-            "description": "Free hot meals at 40+ dining sites across the Twin Cities. No ID or registration required. Community dining atmosphere with dignity-focused service.",
-            "address": "1325 4th St SE",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55414",
-            "phone": "(612) 377-9810",
-            "website": "https://loavesandfishesmn.org",
-            "hours": "Meal times vary by location",
-            "services": ["Hot Meals", "Community Dining", "Multiple Locations", "No Registration Required"],
-            "latitude": 44.9755,
-            "longitude": -93.2303,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You want a hot meal in a welcoming setting with no questions asked.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "The Salvation Army Twin Cities",
-            "category": "food",
-            "description": "Food pantry plus emergency assistance for utilities, rent, and prescriptions. Walk-in service with brief intake. Also offers seasonal programs like holiday meals and back-to-school supplies.",
-            "address": "2445 Prior Ave N",
-            "city": "Roseville",
-            "state": "MN",
-            "zip_code": "55113",
-            "phone": "(651) 746-3400",
-            "website": "https://salvationarmynorth.org",
-            "hours": "Mon-Fri 9am-4pm",
-            "services": ["Food Pantry", "Utility Assistance", "Rent Help", "Holiday Programs"],
-            "latitude": 45.0178,
-            "longitude": -93.1549,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You need food plus help with bills or other emergency needs.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Hennepin County SNAP Office",
-            "category": "food",
-            "description": "SNAP (food stamps) enrollment and ongoing case management. Apply online, by phone, or in person. Benefits typically loaded within 30 days of approval; expedited service for emergencies.",
-            "address": "525 Portland Ave",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55415",
-            "phone": "(612) 596-1300",
-            "website": "https://hennepin.us/snap",
-            "hours": "Mon-Fri 8am-4:30pm",
-            "services": ["SNAP Enrollment", "Application Assistance", "Case Management", "Expedited Benefits"],
-            "latitude": 44.9738,
-            "longitude": -93.2628,
-            "serving_area": "Hennepin County",
-            "good_fit_if": "You want to apply for SNAP benefits or need help with your existing case.",
-            "reentry_focused": False,
-            "cost": "Free to apply",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== ADDITIONAL HOUSING ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Damascus Way Reentry Center",
-            "category": "housing",
-            "description": "Faith-based peer recovery housing for men with 60-day to 12-month stays. Combines 24/7 structured environment with recovery groups, Bible studies, AA meetings, and trauma-informed practices. Full-time work or school required.",
-            "address": "5765 Wayzata Blvd",
-            "city": "Golden Valley",
-            "state": "MN",
-            "zip_code": "55416",
-            "phone": "(763) 231-0198",
-            "website": "https://damascusway.com",
-            "hours": "24/7",
-            "services": ["Peer Recovery Housing", "Recovery Groups", "Employment Support", "Financial Workshops", "Case Management"],
-            "latitude": 44.9747,
-            "longitude": -93.3714,
-            "serving_area": "Hennepin, Scott, Olmsted counties",
-            "good_fit_if": "You're a man seeking structured faith-based housing with recovery support and accountability.",
-            "reentry_focused": True,
-            "cost": "Program fees apply",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Central Minnesota Reentry Project",
-            "category": "housing",
-            "description": "Transitional housing in St. Cloud area with individual rooms in shared environment. Self-directed approach with case manager support for jobs, ID documents, transportation, and family services. Must be within 365 days of release.",
-            "address": "PO Box 2391",
-            "city": "St. Cloud",
-            "state": "MN",
-            "zip_code": "56302",
-            "phone": "(320) 656-9004",
-            "website": "https://cmnrp.org",
-            "hours": "Tue-Thu 10am-4pm (by appointment)",
-            "services": ["Transitional Housing", "ID Assistance", "Employment Help", "Transportation Planning", "Family Services"],
-            "latitude": 45.5579,
-            "longitude": -94.1636,
-            "serving_area": "Stearns, Benton, Sherburne counties",
-            "good_fit_if": "You have a felony in Stearns, Benton, or Sherburne County and need transitional housing within a year of release.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Wayside Recovery Center",
-            "category": "housing",
-            "description": "Women-only residential treatment with supportive housing. 41-bed treatment facility plus 20 housing units including 16 for mothers with young children. Gender-specific programming with MAT available. LGBTQ+ friendly.",
-            "address": "3705 Park Center Blvd",
-            "city": "St. Louis Park",
-            "state": "MN",
-            "zip_code": "55416",
-            "phone": "(952) 546-2016",
-            "website": "https://waysiderecovery.org",
-            "hours": "24/7",
-            "services": ["Women's Residential Treatment", "Mother-Child Housing", "MAT", "Mental Health Services", "Family Treatment"],
-            "latitude": 44.9483,
-            "longitude": -93.3477,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You're a woman needing addiction treatment with housing, especially if you have young children.",
-            "reentry_focused": False,
-            "cost": "Insurance accepted, financial assistance available",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "RADIAS Health ReEntry Crisis Residential",
-            "category": "housing",
-            "description": "3-10 day crisis stabilization for adults in mental health crisis. Links to housing, employment, treatment, and benefits. Same-day admissions available. Bridge between hospital and community.",
-            "address": "1800 Chicago Ave",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55404",
-            "phone": "(612) 870-8300",
-            "website": "https://radiashealth.org",
-            "hours": "24/7",
-            "services": ["Crisis Stabilization", "Housing Linkage", "Employment Linkage", "Benefits Assistance", "Treatment Coordination"],
-            "latitude": 44.9589,
-            "longitude": -93.2622,
-            "serving_area": "Hennepin County",
-            "good_fit_if": "You're in mental health crisis and need short-term stabilization with help connecting to services.",
-            "reentry_focused": True,
-            "cost": "Insurance accepted, sliding scale",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== ADDITIONAL EMPLOYMENT ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Ujamaa Place",
-            "category": "employment",
-            "description": "Holistic support for young African-American men ages 18-30. Combines stable housing, employment training, education, and personal development. Evidence-based approach with high job placement and low recidivism rates.",
-            "address": "1821 University Ave W, Suite N175",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55104",
-            "phone": "(651) 414-1349",
-            "website": "https://ujamaaplace.org",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["Employment Training", "Housing Support", "Education", "Personal Development", "Career Coaching"],
-            "latitude": 44.9556,
-            "longitude": -93.1783,
-            "serving_area": "Ramsey County",
-            "good_fit_if": "You're a young African-American man looking for comprehensive support including housing, jobs, and personal growth.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Minnesota DOC Reentry Services",
-            "category": "employment",
-            "description": "State Department of Corrections pre-release and post-release support. Helps with ID documents, housing plans, employment, and benefits enrollment. Free birth certificate and state ID for eligible inmates upon release.",
-            "address": "1450 Energy Park Dr, Suite 200",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55108",
-            "phone": "(651) 361-7200",
-            "website": "https://mn.gov/doc/community-supervision/reentry/",
-            "hours": "Mon-Fri 8am-4:30pm",
-            "services": ["Pre-Release Planning", "Free ID Assistance", "Housing Plans", "Employment Referrals", "Benefits Enrollment"],
-            "latitude": 44.9778,
-            "longitude": -93.1712,
-            "serving_area": "Statewide",
-            "good_fit_if": "You're currently incarcerated or recently released and need help with IDs, housing plans, or connecting to services.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Ramsey County Workforce Solutions",
-            "category": "employment",
-            "description": "County employment services at CareerForce St. Paul location. Job search assistance, career counseling, training grants, and specialized programs for people with barriers. Partners with reentry programs.",
-            "address": "332 Minnesota St, Suite E200",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55101",
-            "phone": "(651) 266-5040",
-            "website": "https://ramseycounty.us/residents/assistance-support/assistance/workforce-solutions",
-            "hours": "Mon-Fri 8am-4:30pm",
-            "services": ["Job Search Help", "Career Counseling", "Training Grants", "Resume Workshops", "Barrier-Specific Programs"],
-            "latitude": 44.9446,
-            "longitude": -93.0942,
-            "serving_area": "Ramsey County",
-            "good_fit_if": "You live in Ramsey County and want employment help through county workforce programs.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== ADDITIONAL LEGAL ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Hennepin County Reentry Court",
-            "category": "legal",
-            "description": "Specialized court program combining supervision with wraparound services. Participants work with judge, case manager, and service providers on housing, employment, treatment. Regular court appearances with graduated incentives.",
-            "address": "300 S 6th St",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55487",
-            "phone": "(612) 596-8000",
-            "website": "https://mncourts.gov/hennepin",
-            "hours": "Mon-Fri 8am-4:30pm",
-            "services": ["Reentry Court", "Case Management", "Housing Support", "Treatment Coordination", "Graduated Incentives"],
-            "latitude": 44.9764,
-            "longitude": -93.2672,
-            "serving_area": "Hennepin County",
-            "good_fit_if": "You're eligible for reentry court and want structured support with court involvement.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== ADDITIONAL HEALTHCARE ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Marty Mann House - Duluth",
-            "category": "healthcare",
-            "description": "Women's residential treatment and sober living in Duluth. Individual and group therapy, emotional wellness, relapse prevention. Short-term (30 days) or extended stays available. Aftercare includes 12-Step connections.",
-            "address": "23 Mesaba Ave",
-            "city": "Duluth",
-            "state": "MN",
-            "zip_code": "55806",
-            "phone": "(218) 727-8117",
-            "website": "https://duluthbethel.org",
-            "hours": "24/7",
-            "services": ["Women's Treatment", "Sober Living", "Group Therapy", "Relapse Prevention", "Aftercare"],
-            "latitude": 46.7867,
-            "longitude": -92.1005,
-            "serving_area": "Duluth / Northern Minnesota",
-            "good_fit_if": "You're a woman in northern Minnesota seeking residential addiction treatment with sober living.",
-            "reentry_focused": False,
-            "cost": "Insurance accepted, self-pay options",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "ANEW Chemical Health - Women's Sober Housing",
-            "category": "healthcare",
-            "description": "Sober housing for single women and mothers with children for up to one year. Requires outpatient program participation. Emphasizes family reunification, community building, and recovery stability.",
-            "address": "1821 University Ave W",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55104",
-            "phone": "(651) 644-5620",
-            "website": "https://anewchemicalhealthservices.org",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["Women's Sober Housing", "Mother-Child Housing", "Outpatient Treatment", "Family Reunification"],
-            "latitude": 44.9556,
-            "longitude": -93.1783,
-            "serving_area": "Ramsey County",
-            "good_fit_if": "You're a woman in recovery who needs stable housing, especially if you have children.",
-            "reentry_focused": False,
-            "cost": "~$150/month plus deposit, subsidies available",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== ADDITIONAL GENERAL SUPPORT ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Hennepin County Coming Home Resource Fair",
-            "category": "legal",
-            "description": "Annual reentry resource fair connecting people to housing, employment, legal, health, and social services. Multiple agencies in one location. Free IDs, haircuts, food, and direct service enrollment often available.",
-            "address": "Various locations",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55415",
-            "phone": "(612) 348-3000",
-            "website": "https://mncjreentry.org/events",
-            "hours": "Event-based (usually annual)",
-            "services": ["Resource Fair", "Service Enrollment", "Free IDs", "Direct Connections", "Multiple Agencies"],
-            "latitude": 44.9778,
-            "longitude": -93.2650,
-            "serving_area": "Hennepin County",
-            "good_fit_if": "You want to connect with many reentry services in one place at an annual event.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "St. Stephen's Human Services - Housing",
-            "category": "housing",
-            "description": "Works specifically with landlords willing to rent to people with criminal records. Housing navigation and placement assistance. Helps overcome background check barriers through landlord relationships.",
-            "address": "2211 Clinton Ave",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55404",
-            "phone": "(612) 874-0311",
-            "website": "https://ststephensmpls.org",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["Housing Navigation", "Landlord Partnerships", "Background-Friendly Housing", "Placement Assistance"],
-            "latitude": 44.9589,
-            "longitude": -93.2650,
-            "serving_area": "Hennepin County",
-            "good_fit_if": "You're having trouble finding housing because of your criminal record.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Solid Ground Sober Housing - Women",
-            "category": "housing",
-            "description": "Faith-based sober house for women in St. Cloud area. Welcomes women at any stage of faith. Community-focused recovery environment with peer support and accountability.",
-            "address": "St. Cloud",
-            "city": "St. Cloud",
-            "state": "MN",
-            "zip_code": "56301",
-            "phone": "(320) 492-1993",
-            "website": "https://solidgroundsoberhousing.com",
-            "hours": "24/7",
-            "services": ["Women's Sober Housing", "Faith-Based Support", "Peer Community", "Recovery Environment"],
-            "latitude": 45.5579,
-            "longitude": -94.1636,
-            "serving_area": "Central Minnesota",
-            "good_fit_if": "You're a woman in recovery looking for faith-friendly sober housing in Central Minnesota.",
-            "reentry_focused": False,
-            "cost": "Weekly rent applies",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== VETERANS & SPECIALIZED ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "MACV - Minnesota Assistance Council for Veterans",
-            "category": "housing",
-            "description": "Comprehensive veteran services including transitional and permanent housing, rental assistance, employment training, and reentry support. Partners with VA for healthcare connections. Hosts annual Fair Chance Reentry Job Fair for justice-involved individuals.",
-            "address": "600 S Highway 169, Suite 1100",
-            "city": "St. Louis Park",
-            "state": "MN",
-            "zip_code": "55426",
-            "phone": "(612) 726-6222",
-            "website": "https://mac-v.org",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["Veteran Housing", "Rental Assistance", "Employment Training", "Reentry Support", "Legal Aid Referrals"],
-            "latitude": 44.9369,
-            "longitude": -93.3540,
-            "serving_area": "Statewide",
-            "good_fit_if": "You're a veteran needing housing, employment, or reentry services.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Salvation Army Harbor Light Center",
-            "category": "housing",
-            "description": "350-bed facility offering emergency, transitional (up to 2 years), and permanent supportive housing. Sober living environment with case management, meals, and employment referrals. 20 beds reserved for veterans.",
-            "address": "1010 Currie Ave N",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55403",
-            "phone": "(612) 767-3100",
-            "website": "https://centralusa.salvationarmy.org/northern/HarborLightCenter",
-            "hours": "24/7",
-            "services": ["Emergency Shelter", "Transitional Housing", "Veteran Housing", "Meals", "Case Management"],
-            "latitude": 44.9828,
-            "longitude": -93.2847,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You need sober housing from emergency shelter to 2-year transitional stay.",
-            "reentry_focused": False,
-            "cost": "Program fees for transitional housing",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Union Gospel Mission Twin Cities",
-            "category": "housing",
-            "description": "Emergency shelter with 350 beds for men and separate shelter for 200 women and children. Long-term recovery program up to 2 years includes biblical counseling, job training, education, and mental health services.",
-            "address": "435 University Ave E",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55130",
-            "phone": "(651) 228-1800",
-            "website": "https://ugmtc.org",
-            "hours": "24/7",
-            "services": ["Emergency Shelter", "Long-Term Recovery", "Job Training", "Mental Health Services", "Meals"],
-            "latitude": 44.9558,
-            "longitude": -93.0831,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You need emergency shelter or a faith-based long-term recovery program.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== NATIVE AMERICAN SERVICES ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "American Indian OIC - Reentry Program",
-            "category": "employment",
-            "description": "Culturally specific reentry services for American Indian adults and youth. Combines case management with job training, cultural connection, violence prevention therapy, and family strengthening. Serves those returning from prisons, jails, and juvenile facilities.",
-            "address": "1845 E Franklin Ave",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55404",
-            "phone": "(612) 341-3358",
-            "website": "https://aioic.org",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["Culturally Specific Reentry", "Case Management", "Job Training", "Cultural Connection", "Family Strengthening"],
-            "latitude": 44.9621,
-            "longitude": -93.2518,
-            "serving_area": "Statewide",
-            "good_fit_if": "You're American Indian and want culturally connected reentry support.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Ombishkaa Initiative (NWICDC)",
-            "category": "housing",
-            "description": "Culturally responsive reentry for Native Americans using Wild Rice model of care and Ojibwe teachings. Provides housing assistance (rent, utilities, deposits), ID funding, case management, and healing from intergenerational trauma.",
-            "address": "1501 Minnesota Ave",
-            "city": "Bemidji",
-            "state": "MN",
-            "zip_code": "56601",
-            "phone": "(218) 759-2022",
-            "website": "https://nwicdc.org/ombishkaa",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["Housing Assistance", "Rent Help", "ID Funding", "Case Management", "Cultural Healing"],
-            "latitude": 47.4733,
-            "longitude": -94.8803,
-            "serving_area": "Northern Minnesota",
-            "good_fit_if": "You're Native American in northern Minnesota seeking culturally grounded reentry support.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== EMPLOYMENT & TRAINING ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Avivo - Career & Technical Education",
-            "category": "education",
-            "description": "Free short-term job training (3 weeks to 3 months) in IT Support, Medical Office, HVAC, and Construction Pre-Apprenticeship. Includes job placement with 70+ employer partners. Programs designed for people with barriers to employment.",
-            "address": "1825 Chicago Ave",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55404",
-            "phone": "(612) 752-8100",
-            "website": "https://avivomn.org",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["IT Training", "Medical Office Training", "Construction Pre-Apprentice", "HVAC Training", "Job Placement"],
-            "latitude": 44.9589,
-            "longitude": -93.2622,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You want free short-term job training with placement support.",
-            "reentry_focused": False,
-            "cost": "Free for eligible individuals",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Project for Pride in Living (PPL)",
-            "category": "employment",
-            "description": "Combines affordable housing with employment readiness training. Job skills programs prepare for entry-level positions with major employers. Also offers homeownership programs and resident support services.",
-            "address": "1035 E Franklin Ave",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55404",
-            "phone": "(612) 455-5100",
-            "website": "https://ppl-inc.org",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["Affordable Housing", "Employment Readiness", "Job Training", "Homeownership Programs", "Resident Services"],
-            "latitude": 44.9621,
-            "longitude": -93.2580,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You want employment training bundled with access to affordable housing.",
-            "reentry_focused": False,
-            "cost": "Free programs, housing costs vary",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== ADDITIONAL LEGAL ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Attorney General Clean Slate Tour",
-            "category": "legal",
-            "description": "Free expungement clinics at locations across Minnesota. Waives $300 filing fee for qualifying individuals. Staff help complete paperwork for sealing criminal records. Events held several times per year in different cities.",
-            "address": "445 Minnesota St, Suite 1400",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55101",
-            "phone": "(651) 296-3353",
-            "website": "https://ag.state.mn.us/Clean-Slate",
-            "hours": "Event-based",
-            "services": ["Free Expungement Clinics", "Filing Fee Waiver", "Record Sealing Assistance"],
-            "latitude": 44.9446,
-            "longitude": -93.0942,
-            "serving_area": "Statewide (traveling clinics)",
-            "good_fit_if": "You want free expungement help at an in-person clinic event.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "HelpSealMyRecord - Hennepin County",
-            "category": "legal",
-            "description": "Online expungement program for Hennepin County cases. Free application, no court appearance if approved. Handles statutory expungements for eligible records. Self-service with guidance.",
-            "address": "Online",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55415",
-            "phone": "(612) 348-5550",
-            "website": "https://hennepinattorney.org/get-help/sealing-criminal-records",
-            "hours": "24/7 Online",
-            "services": ["Online Expungement", "No Court Appearance", "Self-Service Filing"],
-            "latitude": 44.9778,
-            "longitude": -93.2650,
-            "serving_area": "Hennepin County",
-            "good_fit_if": "You have a Hennepin County record and want to apply for expungement online.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== SPECIALIZED POPULATIONS ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Breaking Free",
-            "category": "housing",
-            "description": "Supportive housing and services for survivors of sex trafficking and prostitution. Combines permanent housing with advocacy, trauma-informed care, education groups, and case management. Serves single women, mothers with children, and young girls.",
-            "address": "2550 University Ave W, Ste 200 N",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55114",
-            "phone": "(651) 645-6557",
-            "website": "https://breakingfreemn.org",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["Survivor Housing", "Case Management", "Trauma-Informed Care", "Support Groups", "Prevention Education"],
-            "latitude": 44.9659,
-            "longitude": -93.1970,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You're a survivor of trafficking or prostitution seeking housing and support services.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Clare Housing",
-            "category": "housing",
-            "description": "Permanent supportive housing for people living with HIV. On-site health services staff with 24/7 support. Serves extremely low-income individuals (under 30% AMI) including singles, couples, and families.",
-            "address": "929 Central Ave NE",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55413",
-            "phone": "(612) 872-8068",
-            "website": "https://clarehousing.org",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["HIV Housing", "On-Site Health Services", "24/7 Support", "Supportive Housing"],
-            "latitude": 45.0008,
-            "longitude": -93.2478,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You're living with HIV and need stable housing with health support.",
-            "reentry_focused": False,
-            "cost": "Income-based",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== ADDITIONAL FOOD ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Neighborhood House Food Markets",
-            "category": "food",
-            "description": "Two free food markets in St. Paul with fresh produce, culturally appropriate foods, and connections to other services. Online appointments available. No income verification required.",
-            "address": "179 Robie St E",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55107",
-            "phone": "(651) 789-2500",
-            "website": "https://neighborhoodhousemn.org",
-            "hours": "Varies by location",
-            "services": ["Free Food Markets", "Fresh Produce", "Culturally Appropriate Foods", "Service Connections"],
-            "latitude": 44.9286,
-            "longitude": -93.0886,
-            "serving_area": "St. Paul",
-            "good_fit_if": "You need free groceries with culturally diverse food options.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Keystone Community Services - Food Shelf",
-            "category": "food",
-            "description": "Serves 52,000 families annually with fresh produce, groceries, and choice-based shopping. Multiple St. Paul locations. Also offers emergency assistance and senior programs.",
-            "address": "1150 Selby Ave",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55104",
-            "phone": "(651) 645-0349",
-            "website": "https://keystoneservices.org",
-            "hours": "Mon-Fri 9am-4pm",
-            "services": ["Food Shelf", "Fresh Produce", "Choice Shopping", "Emergency Assistance"],
-            "latitude": 44.9489,
-            "longitude": -93.1356,
-            "serving_area": "St. Paul",
-            "good_fit_if": "You need groceries in St. Paul with choice-based shopping.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== EMERGENCY ASSISTANCE ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Hennepin County Emergency Assistance",
-            "category": "food",
-            "description": "Short-term cash grants for families with children or pregnant individuals facing eviction, foreclosure, or utility shutoffs. Also helps with deposits and moving costs. Apply online, by phone, or in person.",
-            "address": "525 Portland Ave",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55415",
-            "phone": "(612) 596-1300",
-            "website": "https://hennepin.us/residents/human-services",
-            "hours": "Mon-Fri 8am-4:30pm",
-            "services": ["Emergency Cash Grants", "Rent Assistance", "Utility Assistance", "Moving Costs"],
-            "latitude": 44.9738,
-            "longitude": -93.2628,
-            "serving_area": "Hennepin County",
-            "good_fit_if": "You have children and face eviction or utility shutoff.",
-            "reentry_focused": False,
-            "cost": "Free to apply",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Ramsey County Emergency Assistance",
-            "category": "food",
-            "description": "Emergency help for families and individuals facing housing crisis. Covers rent, utilities, and other emergency costs. Apply through county human services or call 211 for referral.",
-            "address": "160 E Kellogg Blvd",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55101",
-            "phone": "(651) 266-4444",
-            "website": "https://ramseycounty.us/residents/assistance-support",
-            "hours": "Mon-Fri 8am-4:30pm",
-            "services": ["Emergency Assistance", "Rent Help", "Utility Help", "Crisis Support"],
-            "latitude": 44.9442,
-            "longitude": -93.0921,
-            "serving_area": "Ramsey County",
-            "good_fit_if": "You're in Ramsey County and need emergency help with rent or utilities.",
-            "reentry_focused": False,
-            "cost": "Free to apply",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== CULTURALLY SPECIFIC SERVICES ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Hmong American Partnership (HAP)",
-            "category": "employment",
-            "description": "Largest Hmong-serving nonprofit in the U.S., helping 25,000+ immigrants/refugees annually. Combines employment counseling with housing search assistance, MNsure/SNAP enrollment, and connections to home furnishing through Bridging. Interpreters available.",
-            "address": "1075 Arcade St",
-            "city": "St. Paul",
-            "state": "MN",
-            "zip_code": "55106",
-            "phone": "(651) 495-9160",
-            "website": "https://hmong.org",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["Employment Counseling", "Housing Search", "Benefits Enrollment", "Interpretation", "Community Support"],
-            "latitude": 44.9678,
-            "longitude": -93.0545,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You're Hmong or Southeast Asian and want culturally connected employment and housing help.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Somali Community Resettlement Services",
-            "category": "housing",
-            "description": "Assists Somali refugee families with housing acclimation, self-sufficiency resources, and integration support. Offices in Rochester and Faribault with Minneapolis-area phone support.",
-            "address": "125 Live St SE",
-            "city": "Rochester",
-            "state": "MN",
-            "zip_code": "55904",
-            "phone": "(612) 353-6380",
-            "website": "https://somalcrs.org",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["Housing Acclimation", "Self-Sufficiency Resources", "Family Stability", "Integration Support"],
-            "latitude": 44.0121,
-            "longitude": -92.4631,
-            "serving_area": "Rochester, Faribault, Twin Cities",
-            "good_fit_if": "You're Somali and need help with housing, family stability, or community integration.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== PRACTICAL NEEDS ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Dress for Success Twin Cities",
-            "category": "employment",
-            "description": "Professional interview and work clothing for women seeking employment. Includes suits, shoes, and accessories. Paired with career coaching and skills training. Appointment required.",
-            "address": "2021 E Hennepin Ave, Suite 320",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55413",
-            "phone": "(651) 493-4100",
-            "website": "https://dressforsuccesstwincities.org",
-            "hours": "By appointment",
-            "services": ["Professional Clothing", "Interview Outfits", "Career Coaching", "Skills Training"],
-            "latitude": 44.9928,
-            "longitude": -93.2270,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You're a woman who needs professional clothing for job interviews or work.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Bridging - Home Furnishings",
-            "category": "housing",
-            "description": "Provides furniture and household goods for people transitioning out of homelessness or crisis. Beds, tables, chairs, kitchenware through agency referral. Operating 37+ years in Twin Cities.",
-            "address": "201 W 87th St",
-            "city": "Bloomington",
-            "state": "MN",
-            "zip_code": "55420",
-            "phone": "(952) 888-1105",
-            "website": "https://bridging.org",
-            "hours": "Mon-Sat 9am-3pm",
-            "services": ["Free Furniture", "Household Goods", "Beds", "Kitchen Items"],
-            "latitude": 44.8569,
-            "longitude": -93.2970,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You're moving into housing and need furniture and household items.",
-            "reentry_focused": False,
-            "cost": "Free (agency referral required)",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Sharing & Caring Hands",
-            "category": "food",
-            "description": "One-stop resource center providing free meals, clothing closet, household items, emergency assistance, medical/dental referrals, and help with rent and utilities. Walk-in service, no appointments.",
-            "address": "525 N 7th St",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55405",
-            "phone": "(612) 338-4640",
-            "website": "https://sharingandcaringhands.org",
-            "hours": "Mon-Fri 8am-4pm, Sat 10am-1pm",
-            "services": ["Free Meals", "Clothing Closet", "Household Items", "Emergency Assistance", "Medical Referrals"],
-            "latitude": 44.9821,
-            "longitude": -93.2847,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You need multiple types of help in one visit - food, clothes, household items, or emergency funds.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Diversion Solutions - Driver's License Reinstatement",
-            "category": "legal",
-            "description": "Only state-authorized driver's license reinstatement program in Minnesota. Helps set up payment plans for outstanding citations, complete required training, and reduce reinstatement fees to $30. Over 12,000 helped since 2009.",
-            "address": "Minneapolis",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55401",
-            "phone": "(612) 746-4170",
-            "website": "https://diversionsolutions.net",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["License Reinstatement", "Payment Plans", "Fee Reduction", "Required Training"],
-            "latitude": 44.9778,
-            "longitude": -93.2650,
-            "serving_area": "Statewide",
-            "good_fit_if": "Your license is suspended and you need help getting it back affordably.",
-            "reentry_focused": True,
-            "cost": "$30 reinstatement fee (reduced from standard)",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Assurance Wireless - Free Phone",
-            "category": "employment",
-            "description": "Federal Lifeline program providing free smartphone and monthly data/minutes for low-income Minnesotans. Qualify through Medicaid, SNAP, SSI, or income below 135% poverty level. Apply online.",
-            "address": "Online",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55401",
-            "phone": "(888) 898-4888",
-            "website": "https://assurancewireless.com",
-            "hours": "24/7 Online",
-            "services": ["Free Smartphone", "Free Monthly Data", "Free Minutes", "Free Texting"],
-            "latitude": 44.9778,
-            "longitude": -93.2650,
-            "serving_area": "Statewide",
-            "good_fit_if": "You need a phone for job searching and qualify for government assistance programs.",
-            "reentry_focused": False,
-            "cost": "Free for qualifying individuals",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== REGIONAL COVERAGE ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Crossing Home - Moorhead",
-            "category": "housing",
-            "description": "Christian accountability transitional housing for men in the Fargo-Moorhead area. Structured program emphasizing faith, accountability, and reintegration support.",
-            "address": "Moorhead",
-            "city": "Moorhead",
-            "state": "MN",
-            "zip_code": "56560",
-            "phone": "(701) 364-0080",
-            "website": "https://crossinghomemoorhead.com",
-            "hours": "24/7",
-            "services": ["Men's Transitional Housing", "Faith-Based Support", "Accountability", "Reintegration"],
-            "latitude": 46.8772,
-            "longitude": -96.7678,
-            "serving_area": "Fargo-Moorhead area",
-            "good_fit_if": "You're a man in the Fargo-Moorhead area seeking faith-based transitional housing.",
-            "reentry_focused": True,
-            "cost": "Program fees apply",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Next Chapter Reentry Project - Rochester",
-            "category": "housing",
-            "description": "Faith-based transitional homes for men (1-year Discipleship Homes program), women (The Lighthouse), and families. Holistic approach including family healing. Also offers non-residential support.",
-            "address": "125 Live St SE",
-            "city": "Rochester",
-            "state": "MN",
-            "zip_code": "55904",
-            "phone": "(507) 529-5799",
-            "website": "https://nextchapterrochester.org",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["Men's Housing", "Women's Housing", "Family Housing", "Holistic Reentry", "Non-Residential Support"],
-            "latitude": 44.0121,
-            "longitude": -92.4631,
-            "serving_area": "Olmsted County / Southeast Minnesota",
-            "good_fit_if": "You're in Rochester area and want faith-based transitional housing for men, women, or families.",
-            "reentry_focused": True,
-            "cost": "Sliding scale",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "180 Degrees Southeast Minnesota",
-            "category": "housing",
-            "description": "60-day transitional housing in Rochester area with same structure as Minneapolis locations. Employment support through SONIC program, case management, and permanent housing navigation.",
-            "address": "Rochester",
-            "city": "Rochester",
-            "state": "MN",
-            "zip_code": "55904",
-            "phone": "(507) 361-0180",
-            "website": "https://180degrees.org/southeastmn.html",
-            "hours": "Mon-Fri 8am-5pm",
-            "services": ["Transitional Housing", "SONIC Employment", "Case Management", "Housing Navigation"],
-            "latitude": 44.0121,
-            "longitude": -92.4631,
-            "serving_area": "Southeast Minnesota",
-            "good_fit_if": "You're in Southeast Minnesota and want structured transitional housing with job support.",
-            "reentry_focused": True,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== CRISIS & MENTAL HEALTH ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Crisis Text Line",
-            "category": "healthcare",
-            "description": "Free 24/7 text-based mental health support. Text HOME to 741741 to connect with a trained crisis counselor. Confidential, no phone call required.",
-            "address": "Text-based",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55401",
-            "phone": "Text HOME to 741741",
-            "website": "https://crisistextline.org",
-            "hours": "24/7",
-            "services": ["Crisis Support", "Text-Based Counseling", "Mental Health Help", "Confidential Support"],
-            "latitude": 44.9778,
-            "longitude": -93.2650,
-            "serving_area": "Nationwide",
-            "good_fit_if": "You're in crisis and prefer texting over calling.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "988 Suicide & Crisis Lifeline",
-            "category": "healthcare",
-            "description": "Free 24/7 crisis support by phone, text, or chat. Call or text 988 for immediate help with suicidal thoughts, mental health crisis, or substance use crisis. Veterans press 1 for specialized support.",
-            "address": "Phone/Text",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55401",
-            "phone": "988",
-            "website": "https://988lifeline.org",
-            "hours": "24/7",
-            "services": ["Crisis Support", "Suicide Prevention", "Mental Health Crisis", "Substance Use Crisis", "Veteran Support"],
-            "latitude": 44.9778,
-            "longitude": -93.2650,
-            "serving_area": "Nationwide",
-            "good_fit_if": "You or someone you know is in immediate mental health crisis.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== PEER RECOVERY ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Recovery Community Network - St. Cloud",
-            "category": "healthcare",
-            "description": "Peer recovery support with one-on-one coaching, weekly phone support, and treatment center visits. Delivered 1,564 coaching sessions in 2024. Serves substance use and co-occurring mental health disorders.",
-            "address": "St. Cloud",
-            "city": "St. Cloud",
-            "state": "MN",
-            "zip_code": "56301",
-            "phone": "(320) 316-0060",
-            "website": "https://recoverycommunitynetwork.com",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["Peer Recovery Coaching", "Phone Support", "Treatment Visits", "Advocacy", "Education"],
-            "latitude": 45.5579,
-            "longitude": -94.1636,
-            "serving_area": "Central Minnesota",
-            "good_fit_if": "You're in recovery and want peer support from people who understand.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Minnesota Recovery Connection",
-            "category": "healthcare",
-            "description": "Peer-led recovery support with recovery coaches, support groups, and community events. All pathways to recovery welcomed. Connects people to treatment, housing, and employment resources.",
-            "address": "Minneapolis",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55401",
-            "phone": "(612) 584-4158",
-            "website": "https://minnesotarecovery.org",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["Recovery Coaching", "Support Groups", "Resource Connections", "Community Events"],
-            "latitude": 44.9778,
-            "longitude": -93.2650,
-            "serving_area": "Statewide",
-            "good_fit_if": "You want peer-led recovery support with connections to other resources.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        # ============== GENERAL RESOURCES ==============
-        {
-            "id": str(uuid.uuid4()),
-            "name": "United Way 211",
-            "category": "legal",
-            "description": "Free 24/7 helpline connecting to 40,000+ social services statewide. Housing, food, utilities, mental health, employment, crisis support. Call 211, text zip code to 898-211, or search online. 100+ languages available.",
-            "address": "Phone/Online",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55401",
-            "phone": "211",
-            "website": "https://211unitedway.org",
-            "hours": "24/7",
-            "services": ["Service Referrals", "Housing Help", "Food Assistance", "Utility Help", "Crisis Support"],
-            "latitude": 44.9778,
-            "longitude": -93.2650,
-            "serving_area": "Statewide",
-            "good_fit_if": "You're not sure where to start and want help finding the right services.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Small Sums Emergency Fund",
-            "category": "employment",
-            "description": "Emergency micro-grants for basic needs including work clothes, non-skid shoes, steel-toe boots, bus passes, and essential items for employment. Fast turnaround for urgent needs.",
-            "address": "Online",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55401",
-            "phone": "(612) 999-7762",
-            "website": "https://smallsums.org",
-            "hours": "Mon-Fri 9am-5pm",
-            "services": ["Work Clothes", "Work Boots", "Bus Passes", "Emergency Funds"],
-            "latitude": 44.9778,
-            "longitude": -93.2650,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You need work clothes, boots, or a bus pass to start a job.",
-            "reentry_focused": False,
-            "cost": "Free",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Metro Transit Reduced Fare Program",
-            "category": "employment",
-            "description": "Half-price bus and light rail fares for seniors, people with disabilities, and Medicare cardholders. Apply online or at Metro Transit service centers. Valid on all regular-route buses and trains.",
-            "address": "560 6th Ave N",
-            "city": "Minneapolis",
-            "state": "MN",
-            "zip_code": "55411",
-            "phone": "(612) 373-3333",
-            "website": "https://metrotransit.org/reduced-fare",
-            "hours": "Mon-Fri 8am-4:30pm",
-            "services": ["Reduced Fare Transit", "Bus Passes", "Light Rail Access"],
-            "latitude": 44.9856,
-            "longitude": -93.2789,
-            "serving_area": "Twin Cities Metro",
-            "good_fit_if": "You're a senior, have a disability, or have Medicare and need affordable transit.",
-            "reentry_focused": False,
-            "cost": "Half-price fares",
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        }
-    ]
-    
-    await db.resources.insert_many(resources)
-    return {"message": f"Successfully seeded {len(resources)} resources"}
+    """Seeding runs once at startup; this only reports whether it has finished"""
+    if await ensure_seeded():
+        return {"message": "Database is seeded"}
+    return {"message": "Seeding is in progress"}
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -1990,8 +1945,21 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Dataset-Version", "X-Next-Cursor", "Retry-After"],
 )
 
+@app.on_event("startup")
+async def load_resources():
+    start_llm_http_client()
+    await migrate_string_datetimes()
+    await ensure_indexes()
+    await assign_missing_counties()
+    await ensure_seeded()
+    await assign_missing_change_seqs()
+    await load_snapshot()
+    await verify_query_plans()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await close_llm_http_client()
     client.close()
@@ -4,18 +4,51 @@ import { MessageCircle, X, Send, Loader2, Bot, User } from "lucide-react";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { ScrollArea } from "@/components/ui/scroll-area";
-import axios from "axios";
 import { v4 as uuidv4 } from "uuid";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
+// Reads the Server-Sent Events from /chat/stream, calling onToken for each chunk of the reply
+const streamChat = async (payload, onToken) => {
+  const response = await fetch(`${API}/chat/stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(payload),
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Chat stream failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const raw = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const event = raw.match(/^event: (.*)$/m)?.[1];
+      const data = JSON.parse(raw.match(/^data: (.*)$/m)?.[1] || "{}");
+      if (event === "token") onToken(data.text);
+      else if (event === "done") return data.response;
+      else if (event === "error") throw new Error(data.detail);
+    }
+  }
+  throw new Error("Chat stream ended before the reply finished");
+};
+
 const ChatBot = () => {
   const { t, i18n } = useTranslation();
   const [isOpen, setIsOpen] = useState(false);
   const [messages, setMessages] = useState([]);
   const [inputValue, setInputValue] = useState("");
   const [isLoading, setIsLoading] = useState(false);
+  const [isStreaming, setIsStreaming] = useState(false);
   const [sessionId] = useState(() => {
     const saved = localStorage.getItem("reentry-chat-session");
     return saved || uuidv4();
@@ -59,26 +92,34 @@ const ChatBot = () => {
     setInputValue("");
     setIsLoading(true);
 
-    try {
-      const response = await axios.post(`${API}/chat`, {
-        message: userMessage.content,
-        session_id: sessionId,
-        history: messages.slice(-10),
-        language: i18n.language
+    const payload = {
+      message: userMessage.content,
+      session_id: sessionId,
+      history: messages.slice(-10),
+      language: i18n.language
+    };
+
+    // Replace the content of the in-progress assistant message (always the last one)
+    const setReply = (update) => {
+      setMessages(prev => {
+        const last = prev[prev.length - 1];
+        return [...prev.slice(0, -1), { ...last, content: update(last.content) }];
       });
+    };
 
-      setMessages(prev => [...prev, {
-        role: "assistant",
-        content: response.data.response
-      }]);
+    try {
+      setMessages(prev => [...prev, { role: "assistant", content: "" }]);
+      const reply = await streamChat(payload, (text) => {
+        setIsStreaming(true);
+        setReply(content => content + text);
+      });
+      setReply(() => reply);
     } catch (error) {
       console.error("Chat error:", error);
-      setMessages(prev => [...prev, {
-        role: "assistant",
-        content: t('chat.error')
-      }]);
+      setReply(() => t('chat.error'));
     } finally {
       setIsLoading(false);
+      setIsStreaming(false);
     }
   };
 
@@ -133,7 +174,7 @@ const ChatBot = () => {
           {/* Messages */}
           <ScrollArea className="flex-1 p-4" ref={scrollAreaRef}>
             <div className="space-y-4">
-              {messages.map((message, index) => (
+              {messages.filter(message => message.content).map((message, index) => (
                 <div
                   key={index}
                   className={`flex gap-3 ${message.role === "user" ? "flex-row-reverse" : ""}`}
@@ -160,7 +201,7 @@ const ChatBot = () => {
                 </div>
               ))}
               
-              {isLoading && (
+              {isLoading && !isStreaming && (
                 <div className="flex gap-3">
                   <div className="w-8 h-8 rounded-lg bg-slate-100 flex items-center justify-center flex-shrink-0">
                     <Bot className="w-4 h-4 text-slate-600" />
@@ -50,14 +50,9 @@ const Home = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        await axios.post(`${API}/seed`);
-        
-        const [catRes, resRes] = await Promise.all([
-          axios.get(`${API}/categories`),
-          axios.get(`${API}/resources`)
-        ]);
-        setCategories(catRes.data.filter(c => c.id !== 'transportation'));
-        setResourceCount(resRes.data.length);
+        const { data } = await axios.get(`${API}/bootstrap`);
+        setCategories(data.categories.filter(c => c.id !== 'transportation'));
+        setResourceCount(data.counts.total);
       } catch (e) {
         console.error("Error fetching data:", e);
       }
@@ -78,20 +78,6 @@ const mnCounties = [
   { name: "Chisago", value: "Chisago" },
 ];
 
-// City to county mapping for filtering
-const cityToCounty = {
-  "Minneapolis": "Hennepin",
-  "St. Paul": "Ramsey",
-  "Rochester": "Olmsted",
-  "St. Cloud": "Stearns",
-  "Duluth": "St. Louis",
-  "Brooklyn Park": "Hennepin",
-  "Edina": "Hennepin",
-  "Golden Valley": "Hennepin",
-  "Roseville": "Ramsey",
-  "Center City": "Chisago",
-};
-
 const Resources = () => {
   const { t } = useTranslation();
   const { addFavorite, removeFavorite, isFavorite } = useFavorites();
@@ -118,23 +104,33 @@ const Resources = () => {
   };
 
   useEffect(() => {
-    const fetchData = async () => {
+    const fetchCategories = async () => {
+      try {
+        const catRes = await axios.get(`${API}/categories`);
+        setCategories(catRes.data.filter(c => c.id !== 'transportation'));
+      } catch (e) {
+        console.error("Error fetching categories:", e);
+      }
+    };
+    fetchCategories();
+  }, []);
+
+  // County filtering happens on the server, so only that county's resources are downloaded
+  useEffect(() => {
+    const fetchResources = async () => {
       try {
         setLoading(true);
-        const [resRes, catRes] = await Promise.all([
-          axios.get(`${API}/resources`),
-          axios.get(`${API}/categories`)
-        ]);
+        const params = selectedCounty && selectedCounty !== "all" ? { county: selectedCounty } : {};
+        const resRes = await axios.get(`${API}/resources`, { params });
         setResources(resRes.data.filter(r => r.category !== 'transportation'));
-        setCategories(catRes.data.filter(c => c.id !== 'transportation'));
       } catch (e) {
-        console.error("Error fetching data:", e);
+        console.error("Error fetching resources:", e);
       } finally {
         setLoading(false);
       }
     };
-    fetchData();
-  }, []);
+    fetchResources();
+  }, [selectedCounty]);
 
   useEffect(() => {
     const category = searchParams.get("category");
@@ -151,16 +147,9 @@ const Resources = () => {
         resource.description.toLowerCase().includes(searchQuery.toLowerCase()) ||
         resource.services.some(s => s.toLowerCase().includes(searchQuery.toLowerCase()));
       
-      // County filter - check city to county mapping
-      let matchesCounty = true;
-      if (selectedCounty && selectedCounty !== "all") {
-        const resourceCounty = cityToCounty[resource.city] || "";
-        matchesCounty = resourceCounty === selectedCounty;
-      }
-      
-      return matchesCategory && matchesSearch && matchesCounty;
+      return matchesCategory && matchesSearch;
     });
-  }, [resources, selectedCategory, searchQuery, selectedCounty]);
+  }, [resources, selectedCategory, searchQuery]);
 
   const handleCategoryClick = (categoryId) => {
     const newCategory = selectedCategory === categoryId ? "" : categoryId;
@@ -5,7 +5,11 @@ Tests all API endpoints: resources, categories, chat, submissions, seed
 import pytest
 import requests
 import os
+import io
+import csv
+import json
 import time
+from datetime import datetime
 
 BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://reentry-connect-1.preview.emergentagent.com')
 
@@ -65,7 +69,18 @@ class TestResourcesEndpoints:
         for resource in data:
             assert "Minneapolis" in resource["city"], f"Expected Minneapolis, got {resource['city']}"
         print(f"✓ City filter 'Minneapolis' returned {len(data)} resources")
-    
+
+    def test_filter_resources_by_county(self):
+        """Test filtering resources by county assigned from coordinates"""
+        response = requests.get(f"{BASE_URL}/api/resources?county=Hennepin")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) > 0
+
+        for resource in data:
+            assert resource["county"] == "Hennepin", f"Expected Hennepin, got {resource['county']}"
+        print(f"✓ County filter 'Hennepin' returned {len(data)} resources")
+
     def test_search_resources(self):
         """Test search functionality"""
         response = requests.get(f"{BASE_URL}/api/resources?search=housing")
@@ -73,7 +88,71 @@ class TestResourcesEndpoints:
         data = response.json()
         assert len(data) > 0
         print(f"✓ Search 'housing' returned {len(data)} resources")
-    
+
+    def test_search_resources_ranked(self):
+        """Test search results are ranked with the best match first"""
+        response = requests.get(f"{BASE_URL}/api/resources?search=expungement")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) > 0
+
+        top = data[0]
+        text = " ".join([top["name"], top["description"]] + top["services"]).lower()
+        assert "expungement" in text, f"Top result '{top['name']}' does not mention the search term"
+        print(f"✓ Search 'expungement' ranked '{top['name']}' first")
+
+    def test_search_resources_no_match(self):
+        """Test search with no matching terms returns an empty list"""
+        response = requests.get(f"{BASE_URL}/api/resources?search=zzqxnomatch")
+        assert response.status_code == 200
+        assert response.json() == []
+        print("✓ Search with no matches returns empty list")
+
+    def test_sparse_fields_card_preset(self):
+        """Test fields=card returns only the compact card fields"""
+        response = requests.get(f"{BASE_URL}/api/resources?fields=card")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) > 0
+        expected = {"id", "name", "category", "city", "latitude", "longitude"}
+        for resource in data:
+            assert set(resource) == expected, f"Unexpected fields: {set(resource) ^ expected}"
+        print(f"✓ fields=card returned {len(data)} compact resources")
+
+    def test_sparse_fields_unknown_field(self):
+        """Test requesting an unknown field returns 400"""
+        response = requests.get(f"{BASE_URL}/api/resources?fields=name,not_a_field")
+        assert response.status_code == 400
+        print("✓ Unknown projection field returns 400")
+
+    def test_paginate_resources_with_cursor(self):
+        """Test walking /api/resources page by page via X-Next-Cursor matches the full listing"""
+        full = requests.get(f"{BASE_URL}/api/resources").json()
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 10}
+            if cursor:
+                params["cursor"] = cursor
+            response = requests.get(f"{BASE_URL}/api/resources", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page) <= 10
+            seen.extend(r["id"] for r in page)
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert seen == [r["id"] for r in full]
+        print(f"✓ Cursor pagination walked {len(seen)} resources")
+
+    def test_invalid_cursor(self):
+        """Test a malformed cursor returns 400"""
+        response = requests.get(f"{BASE_URL}/api/resources?cursor=not-a-cursor")
+        assert response.status_code == 400
+        print("✓ Invalid cursor returns 400")
+
     def test_get_single_resource(self):
         """Test GET /api/resources/{id} returns single resource"""
         # First get all resources to get a valid ID
@@ -129,6 +208,214 @@ class TestResourcesEndpoints:
         print("✓ Created resource verified via GET")
 
 
+class TestExportEndpoint:
+    """Test /api/resources/export streaming export"""
+
+    def test_export_ndjson(self):
+        """Test NDJSON export streams one resource per line"""
+        response = requests.get(f"{BASE_URL}/api/resources/export?format=ndjson", stream=True)
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("application/x-ndjson")
+
+        count = 0
+        for line in response.iter_lines():
+            if line:
+                resource = json.loads(line)
+                assert "id" in resource and "name" in resource
+                count += 1
+        assert count > 0
+        print(f"✓ NDJSON export streamed {count} resources")
+
+    def test_export_csv(self):
+        """Test CSV export has a header row and one row per resource"""
+        response = requests.get(f"{BASE_URL}/api/resources/export?format=csv")
+        assert response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) > 0
+        assert "name" in rows[0] and "latitude" in rows[0]
+        print(f"✓ CSV export returned {len(rows)} rows")
+
+    def test_export_unknown_format(self):
+        """Test an unsupported export format returns 422"""
+        response = requests.get(f"{BASE_URL}/api/resources/export?format=xml")
+        assert response.status_code == 422
+        print("✓ Unknown export format returns 422")
+
+
+class TestConditionalRequests:
+    """Test ETag / If-None-Match handling on cacheable endpoints"""
+
+    def test_resources_not_modified(self):
+        """Test GET /api/resources returns 304 when the ETag still matches"""
+        response = requests.get(f"{BASE_URL}/api/resources")
+        assert response.status_code == 200
+        etag = response.headers.get("ETag")
+        assert etag, "Missing ETag header"
+        assert "Cache-Control" in response.headers
+
+        cached = requests.get(f"{BASE_URL}/api/resources", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        print(f"✓ GET /api/resources with matching ETag returns 304")
+
+    def test_filtered_resources_have_distinct_etag(self):
+        """Test a different query does not reuse another query's ETag"""
+        all_etag = requests.get(f"{BASE_URL}/api/resources").headers["ETag"]
+        response = requests.get(f"{BASE_URL}/api/resources?category=food", headers={"If-None-Match": all_etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != all_etag
+        print("✓ Filtered query has its own ETag")
+
+    def test_categories_not_modified(self):
+        """Test GET /api/categories returns 304 when the ETag still matches"""
+        etag = requests.get(f"{BASE_URL}/api/categories").headers["ETag"]
+        cached = requests.get(f"{BASE_URL}/api/categories", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        print("✓ GET /api/categories with matching ETag returns 304")
+
+
+class TestNearbyResourcesEndpoint:
+    """Test /api/resources/near geospatial endpoint"""
+
+    def test_nearby_resources_sorted_by_distance(self):
+        """Test GET /api/resources/near returns resources nearest first within the radius"""
+        params = {"lat": 44.9778, "lng": -93.2650, "radius_km": 25, "limit": 10}
+        response = requests.get(f"{BASE_URL}/api/resources/near", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert 0 < len(data) <= 10
+
+        distances = [r["distance_km"] for r in data]
+        assert distances == sorted(distances), "Results are not sorted by distance"
+        assert all(d <= 25 for d in distances), "Result outside requested radius"
+        print(f"✓ GET /api/resources/near returned {len(data)} resources within 25 km")
+
+    def test_nearby_resources_requires_coordinates(self):
+        """Test GET /api/resources/near without lat/lng returns 422"""
+        response = requests.get(f"{BASE_URL}/api/resources/near")
+        assert response.status_code == 422
+        print("✓ GET /api/resources/near without coordinates returns 422")
+
+
+class TestSnapshotEndpoint:
+    """Test /api/snapshot dataset version reporting"""
+
+    def test_snapshot_version_advances_after_write(self):
+        """Test creating a resource bumps the dataset version served by reads"""
+        before = requests.get(f"{BASE_URL}/api/snapshot").json()
+        assert "version" in before
+        assert "resource_count" in before
+
+        new_resource = {
+            "name": "TEST_Snapshot Resource",
+            "category": "food",
+            "description": "Test resource for snapshot versioning",
+            "address": "789 Test Blvd",
+            "city": "Minneapolis",
+            "zip_code": "55401",
+            "latitude": 44.9778,
+            "longitude": -93.2650
+        }
+        create_response = requests.post(f"{BASE_URL}/api/resources", json=new_resource)
+        assert create_response.status_code == 201
+
+        # Requests may land on any worker; each picks up the new version within its refresh interval
+        deadline = time.time() + 15
+        while True:
+            after = requests.get(f"{BASE_URL}/api/snapshot").json()
+            list_version = int(requests.get(f"{BASE_URL}/api/resources").headers["X-Dataset-Version"])
+            if (after["version"] > before["version"] and list_version > before["version"]) or time.time() > deadline:
+                break
+            time.sleep(1)
+
+        assert after["version"] > before["version"]
+        assert list_version > before["version"]
+        print(f"✓ Dataset version advanced from {before['version']} to {after['version']}")
+
+
+class TestChangesFeed:
+    """Test /api/resources/changes delta sync"""
+
+    def latest_token(self):
+        token = 0
+        while True:
+            page = requests.get(f"{BASE_URL}/api/resources/changes", params={"since": token, "limit": 1000}).json()
+            token = page["next"]
+            if not page["has_more"]:
+                return token
+
+    def test_feed_reports_inserts(self):
+        """Test a created resource shows up as an upsert after the latest token"""
+        token = self.latest_token()
+
+        new_resource = {
+            "name": "TEST_Changes Feed Resource",
+            "category": "legal",
+            "description": "Test resource for the changes feed",
+            "address": "321 Test Ave",
+            "city": "Minneapolis",
+            "zip_code": "55401",
+            "latitude": 44.9778,
+            "longitude": -93.2650
+        }
+        created = requests.post(f"{BASE_URL}/api/resources", json=new_resource).json()
+
+        response = requests.get(f"{BASE_URL}/api/resources/changes", params={"since": token})
+        assert response.status_code == 200
+        data = response.json()
+        ours = [c for c in data["changes"] if c.get("resource", {}).get("id") == created["id"]]
+        assert [c["op"] for c in ours] == ["upsert"]
+        assert ours[0]["resource"]["name"] == new_resource["name"]
+        assert data["next"] >= ours[-1]["seq"]
+
+        empty = requests.get(f"{BASE_URL}/api/resources/changes", params={"since": data["next"]}).json()
+        assert all(c["seq"] > data["next"] for c in empty["changes"])
+        print(f"✓ Changes feed reported {len(data['changes'])} changes since {token}")
+
+    def test_resources_cannot_be_deleted_over_http(self):
+        """Test there is no public DELETE route for resources"""
+        response = requests.delete(f"{BASE_URL}/api/resources/non-existent-id-12345")
+        assert response.status_code == 405
+        print("✓ DELETE /api/resources/{id} is not allowed")
+
+
+class TestBootstrapEndpoint:
+    """Test /api/bootstrap bundled home page payload"""
+
+    def test_bootstrap_bundles_categories_counts_and_cards(self):
+        """Test bootstrap matches /categories and the card listing, compressed and versioned"""
+        response = requests.get(f"{BASE_URL}/api/bootstrap", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers.get("Content-Encoding") == "gzip"
+        assert "ETag" in response.headers
+        data = response.json()
+
+        assert data["categories"] == requests.get(f"{BASE_URL}/api/categories").json()
+        assert data["counts"]["total"] == len(data["resources"])
+        assert sum(data["counts"][c["id"]] for c in data["categories"]) <= data["counts"]["total"]
+        assert set(data["resources"][0].keys()) == {"id", "name", "category", "city", "latitude", "longitude"}
+        assert int(response.headers["X-Dataset-Version"]) == data["version"]
+
+        assert response.headers.get("Vary") == "Accept-Encoding"
+        print(f"✓ Bootstrap returned {len(data['resources'])} cards for dataset version {data['version']}")
+
+
+    def test_bootstrap_revalidates_with_304(self):
+        """Test a matching If-None-Match gets a 304 that still varies on Accept-Encoding"""
+        # Workers can briefly serve different dataset versions after a write, so retry until two requests agree
+        deadline = time.time() + 15
+        while True:
+            etag = requests.get(f"{BASE_URL}/api/bootstrap", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+            cached = requests.get(f"{BASE_URL}/api/bootstrap", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+            if cached.status_code == 304 or time.time() > deadline:
+                break
+            time.sleep(0.5)
+        assert cached.status_code == 304
+        assert cached.headers.get("ETag") == etag
+        assert cached.headers.get("Vary") == "Accept-Encoding"
+        print("✓ Bootstrap revalidation returned 304 with Vary: Accept-Encoding")
+
+
 class TestCategoriesEndpoint:
     """Test /api/categories endpoint"""
     
@@ -191,6 +478,29 @@ class TestChatEndpoint:
         assert "response" in data
         print(f"✓ Chat with history response: {data['response'][:100]}...")
     
+    def test_chat_stream(self):
+        """Test POST /api/chat/stream sends token events followed by a done event"""
+        chat_request = {
+            "message": "Where can I get food?",
+            "session_id": "test-session-stream",
+            "history": []
+        }
+
+        response = requests.post(f"{BASE_URL}/api/chat/stream", json=chat_request, stream=True, timeout=30)
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/event-stream")
+
+        events = []
+        for block in response.text.strip().split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in block.splitlines())
+            events.append((lines["event"], json.loads(lines["data"])))
+
+        assert events[-1][0] == "done"
+        tokens = "".join(data["text"] for event, data in events if event == "token")
+        assert tokens == events[-1][1]["response"]
+        assert len(tokens) > 0
+        print(f"✓ Chat stream sent {len(events) - 1} token events: {tokens[:100]}...")
+
     def test_chat_conversational_flow(self):
         """Test that chatbot asks clarifying questions before detailed answer"""
         chat_request = {
@@ -209,6 +519,21 @@ class TestChatEndpoint:
         print(f"✓ Conversational flow: Initial response is concise ({len(response_text)} chars)")
 
 
+class TestLlmBulkhead:
+    """Test the concurrency limit around upstream LLM calls"""
+
+    def test_metrics_report_bulkhead_state(self):
+        """Test /api/metrics exposes queue depth and wait time for LLM calls"""
+        response = requests.get(f"{BASE_URL}/api/metrics")
+        assert response.status_code == 200
+        bulkhead = response.json()["llm_bulkhead"]
+
+        for key in ["max_concurrent", "in_flight", "queue_depth", "rejected", "avg_wait_ms", "max_wait_ms"]:
+            assert key in bulkhead, f"Missing bulkhead metric: {key}"
+        assert bulkhead["in_flight"] <= bulkhead["max_concurrent"]
+        print(f"✓ Bulkhead: {bulkhead['in_flight']}/{bulkhead['max_concurrent']} in flight, {bulkhead['rejected']} rejected")
+
+
 class TestSubmissionsEndpoint:
     """Test /api/submissions endpoint"""
     
@@ -275,6 +600,18 @@ class TestDataIntegrity:
         
         print(f"✓ All {len(resources)} resources have valid categories")
     
+    def test_resources_have_timezone_aware_timestamps(self):
+        """Verify created_at/updated_at are returned as UTC ISO-8601 timestamps"""
+        response = requests.get(f"{BASE_URL}/api/resources")
+        resources = response.json()
+
+        for resource in resources:
+            for field in ("created_at", "updated_at"):
+                value = datetime.fromisoformat(resource[field].replace("Z", "+00:00"))
+                assert value.tzinfo is not None, f"Resource '{resource['name']}' has naive {field}"
+
+        print(f"✓ All {len(resources)} resources have UTC timestamps")
+
     def test_resources_have_valid_coordinates(self):
         """Verify all resources have valid lat/long for Minnesota"""
         response = requests.get(f"{BASE_URL}/api/resources")
@@ -0,0 +1,896 @@
+"""
+In-process tests for backend helpers that the HTTP tests can't pin down reliably
+Imports backend/server.py directly; no API server, Mongo or LLM key is needed
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+import pytest
+from fastapi import HTTPException, Request, Response
+from pydantic import TypeAdapter
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_database")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import ingest_resources  # noqa: E402
+import server  # noqa: E402
+from benchmark_serialization import make_resources, per_request_body  # noqa: E402
+
+
+class TestSearchCursors:
+    """Test keyset cursors for plain and ranked listings"""
+
+    def test_plain_cursor_round_trip_ignores_version(self):
+        """Test (name, id) cursors survive a dataset version change"""
+        cursor = server.encode_cursor(("180 Degrees", "abc"))
+        assert server.decode_cursor(cursor, ranked=False, version=7) == ("180 Degrees", "abc")
+        print("✓ Plain cursor decodes under any dataset version")
+
+    def test_ranked_cursor_rejected_after_version_change(self):
+        """Test a search cursor is only accepted by the dataset version that issued it"""
+        cursor = server.encode_cursor((-3.5, "abc"), version=4)
+        assert server.decode_cursor(cursor, ranked=True, version=4) == (-3.5, "abc")
+        with pytest.raises(HTTPException) as error:
+            server.decode_cursor(cursor, ranked=True, version=5)
+        assert error.value.status_code == 400
+        print("✓ Ranked cursor from an older dataset version returns 400")
+
+
+    def test_filter_pages_resume_after_the_last_result(self):
+        """Test paging through a snapshot visits every resource once, and an empty page keeps its place"""
+        snapshot = server.ResourceSnapshot(1, make_resources(7))
+        seen, after = [], None
+        while True:
+            page, after = snapshot.filter(after=after, limit=3)
+            seen += [resource["id"] for resource in page]
+            if after is None:
+                break
+        assert seen == [resource["id"] for resource in snapshot.resources]
+        first, cursor = snapshot.filter(limit=3)
+        assert snapshot.filter(after=cursor, limit=0) == ([], cursor)
+        print("✓ Snapshot pages resume after their last result")
+
+
+class TestPreSerializedBodies:
+    """Test snapshot bodies against the old response_model=List[Resource] path"""
+
+    def test_encode_list_is_byte_identical_to_response_model(self):
+        """Test pre-serialized listing bytes equal validate-then-JSONResponse bytes"""
+        resources = make_resources(50)
+        # Cover the cases most likely to diverge: unset optionals, non-ASCII text, non-UTC and whole-second times
+        resources[0].update(phone=None, website=None, hours=None, services=[], cost=None, county=None)
+        resources[1].update(name="Centro de Recursos Latinos — Café", description="Ñandú \u2603 \"quoted\"")
+        resources[2]["created_at"] = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=-6)))
+        resources[3]["updated_at"] = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        snapshot = server.ResourceSnapshot(1, resources)
+        page, _ = snapshot.filter()
+
+        expected = per_request_body(TypeAdapter(List[server.Resource]), page)
+        assert snapshot.encode_list(page) == expected
+        print(f"✓ Pre-serialized body matches response_model encoding ({len(expected)} bytes)")
+
+
+class TestChatAnswerCache:
+    """Test first-turn answer cache keys and eviction (per worker, so not observable over HTTP)"""
+
+    def test_rephrasings_share_a_key(self):
+        """Test equivalent opening questions normalize to the same key"""
+        assert server.normalize_question("I need housing") == server.normalize_question("Where can I get housing?")
+        assert server.normalize_question("Find food banks") == server.normalize_question("food bank")
+        assert server.normalize_question("I need housing") != server.normalize_question("I need a lawyer")
+        print("✓ Rephrased questions share a cache key")
+
+    def test_only_first_turns_are_cached(self):
+        """Test follow-up turns get no cache key"""
+        greeting = [server.ChatMessage(role="assistant", content="Hi, how can I help?")]
+        first = server.ChatRequest(message="I need housing", session_id="s", history=greeting)
+        follow_up = server.ChatRequest(
+            message="In Duluth", session_id="s",
+            history=greeting + [server.ChatMessage(role="user", content="I need housing")]
+        )
+        assert server.answer_cache_key(first) == "hous"
+        assert server.answer_cache_key(follow_up) is None
+        assert server.answer_cache_key(server.ChatRequest(message="hi there", session_id="s")) is None
+        print("✓ Only opening questions are cached")
+
+    def test_hits_misses_and_version_invalidation(self):
+        """Test a stored answer is served for its dataset version and dropped when the version changes"""
+        cache = server.AnswerCache(max_size=10, ttl_seconds=60)
+        assert cache.get("hous", 1) is None
+        cache.put("hous", 1, "Try 180 Degrees.")
+        assert cache.get("hous", 1) == "Try 180 Degrees."
+        assert cache.get("hous", 2) is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["size"], stats["dataset_version"]) == (1, 2, 0, 2)
+        print("✓ Answer cache hits, misses and clears on a new dataset version")
+
+    def test_lru_and_ttl_eviction(self):
+        """Test the cache keeps at most max_size answers and expires old ones"""
+        cache = server.AnswerCache(max_size=2, ttl_seconds=60)
+        cache.put("a", 1, "A")
+        cache.put("b", 1, "B")
+        cache.get("a", 1)
+        cache.put("c", 1, "C")
+        assert cache.get("b", 1) is None
+        assert cache.get("a", 1) == "A" and cache.get("c", 1) == "C"
+
+        expired = server.AnswerCache(max_size=2, ttl_seconds=0)
+        expired.put("a", 1, "A")
+        assert expired.get("a", 1) is None
+        print("✓ Answer cache evicts least recently used and expired answers")
+
+
+class RecordingLlmChat:
+    """Stands in for LlmChat and records what each turn would send upstream"""
+    calls = []
+
+    def __init__(self, api_key, session_id, system_message, initial_messages):
+        self.system_message = system_message
+        self.initial_messages = initial_messages
+
+    def with_model(self, provider, model):
+        return self
+
+    async def send_message(self, message):
+        RecordingLlmChat.calls.append((self.system_message, self.initial_messages, message.text))
+        return f"reply {len(RecordingLlmChat.calls)}"
+
+
+class TestChatGrounding:
+    """Test directory matches are sent as per-turn context only"""
+
+    def test_context_is_not_kept_in_history(self, monkeypatch):
+        """Test each turn carries its own matches and earlier matches never reach the history"""
+        monkeypatch.setattr(server, "LlmChat", RecordingLlmChat)
+        RecordingLlmChat.calls = []
+        system = server.CHAT_SYSTEM_MESSAGE
+        conversation = server.EmergentProvider().conversation("s", system, server.build_chat_context(system, []))
+
+        asyncio.run(conversation.send("I need housing", "Directory matches: HOUSING-CONTEXT"))
+        asyncio.run(conversation.send("In Duluth please", "Directory matches: DULUTH-CONTEXT"))
+
+        second_system, second_messages, second_text = RecordingLlmChat.calls[1]
+        assert second_text == "In Duluth please"
+        assert "DULUTH-CONTEXT" in second_system
+        assert "HOUSING-CONTEXT" not in str(second_messages)
+        assert second_messages[1:] == [
+            {"role": "user", "content": "I need housing"},
+            {"role": "assistant", "content": "reply 1"},
+        ]
+        print("✓ Grounding context is per turn and history holds only the raw turns")
+
+    def test_conversation_is_built_from_client_history(self, monkeypatch):
+        """Test each request's conversation carries the turns the client sent, and nothing else"""
+        request = server.ChatRequest(message="In Duluth", session_id="s", history=[
+            server.ChatMessage(role="assistant", content="Hi, how can I help?"),
+            server.ChatMessage(role="user", content="I need housing"),
+            server.ChatMessage(role="assistant", content="Which city?"),
+        ])
+        monkeypatch.setattr(server, "llm_provider", server.EmergentProvider())
+        conversation = server.new_chat(request)
+        assert conversation.turns == [{"role": msg.role, "content": msg.content} for msg in request.history]
+        print("✓ Conversation rebuilt from the client's history")
+
+    def test_retrieval_prefers_category_and_place(self):
+        """Test retrieval ranks a resource matching both category and city first"""
+        snapshot = server.ResourceSnapshot(1, [
+            dict(resource, name=name, category=category, city=city, county=None)
+            for resource, (name, category, city) in zip(make_resources(3), [
+                ("Duluth Food Shelf", "food", "Duluth"),
+                ("Duluth Housing Help", "housing", "Duluth"),
+                ("Metro Housing Help", "housing", "Minneapolis"),
+            ])
+        ])
+        matches = server.retrieve_resources(snapshot, "I need housing in Duluth", limit=3)
+        assert matches[0]["name"] == "Duluth Housing Help"
+        assert server.grounding_context(snapshot, "zzz qqq") is None
+        print("✓ Retrieval ranks category and place matches first")
+
+
+class ScriptedConversation(server.Conversation):
+    """Conversation that streams fixed chunks, optionally after a delay"""
+
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = chunks
+        self.delay = delay
+
+    async def send(self, text, context=None):
+        return "".join([chunk async for chunk in self.stream(text, context)])
+
+    async def stream(self, text, context=None):
+        await asyncio.sleep(self.delay)
+        for chunk in self.chunks:
+            yield chunk
+
+
+@pytest.fixture
+def chat_env(monkeypatch):
+    """Serve the chat endpoints from a small in-memory snapshot; call the result to script the conversation"""
+    snapshot = server.ResourceSnapshot(1, make_resources(5))
+
+    async def get_snapshot():
+        return snapshot
+
+    monkeypatch.setattr(server, "get_snapshot", get_snapshot)
+    monkeypatch.setattr(server, "llm_provider", server.StubProvider())
+    monkeypatch.setattr(server, "answer_cache", server.AnswerCache(10, 60))
+    monkeypatch.setattr(server, "llm_bulkhead", server.Bulkhead(2, 2, 10, 5))
+
+    def use(conversation):
+        monkeypatch.setattr(server, "new_chat", lambda request: conversation)
+    return use
+
+
+async def read_stream(request):
+    response = await server.chat_stream(request)
+    return "".join([chunk async for chunk in response.body_iterator])
+
+
+class TestChatStreamDeadline:
+    """Test /chat/stream bounds its latency and releases its bulkhead slot early"""
+
+    def test_deadline_covers_waiting_for_a_slot(self, chat_env, monkeypatch):
+        """Test a stream queued behind busy bulkhead slots answers with the fallback by the deadline"""
+        chat_env(ScriptedConversation(["Hello"]))
+        monkeypatch.setattr(server, "CHAT_DEADLINE_SECONDS", 0.2)
+        monkeypatch.setattr(server, "llm_bulkhead", server.Bulkhead(1, 2, 10, 5))
+        request = server.ChatRequest(message="In Duluth", session_id="queued")
+
+        async def run():
+            release = asyncio.Event()
+
+            async def busy_call():
+                async with server.llm_bulkhead.slot():
+                    await release.wait()
+
+            holder = asyncio.create_task(busy_call())
+            await asyncio.sleep(0)
+            started = time.monotonic()
+            body = await read_stream(request)
+            elapsed = time.monotonic() - started
+            release.set()
+            await holder
+            return body, elapsed
+
+        body, elapsed = asyncio.run(run())
+        assert elapsed < 1
+        assert "I could not put together a full answer just now" in body
+        assert "event: done" in body
+        print(f"✓ Stream waiting for a bulkhead slot fell back after {elapsed:.2f}s")
+
+    def test_slot_is_released_before_a_slow_reader_finishes(self, chat_env):
+        """Test the bulkhead slot is freed once the model is done, not when the client has read everything"""
+        chat_env(ScriptedConversation(["One ", "two ", "three"]))
+        request = server.ChatRequest(message="housing help please", session_id="slow-reader")
+
+        async def run():
+            response = await server.chat_stream(request)
+            events = response.body_iterator
+            first = await events.__anext__()
+            await asyncio.sleep(0.05)
+            in_flight = server.llm_bulkhead.in_flight
+            rest = "".join([chunk async for chunk in events])
+            return first + rest, in_flight
+
+        body, in_flight = asyncio.run(run())
+        assert in_flight == 0
+        assert '"response": "One two three"' in body
+        print("✓ Bulkhead slot released while the client was still reading")
+
+
+def stub_provider(monkeypatch, reply="echo", latency="fixed:0", token_delay_ms="0"):
+    monkeypatch.setenv("LLM_STUB_REPLY", reply)
+    monkeypatch.setenv("LLM_STUB_LATENCY", latency)
+    monkeypatch.setenv("LLM_STUB_TOKEN_DELAY_MS", token_delay_ms)
+    monkeypatch.setenv("LLM_STUB_SEED", "7")
+    return server.StubProvider()
+
+
+class TestStubProvider:
+    """Test the offline provider used for load tests"""
+
+    def test_echo_returns_the_raw_message(self, monkeypatch):
+        """Test echo mode repeats the user's text exactly, whatever it contains"""
+        conversation = stub_provider(monkeypatch).conversation("s", "system", [])
+        text = "Message: I need housing. Message: in Duluth"
+        assert asyncio.run(conversation.send(text, "Directory matches: ignored")) == text
+        print("✓ Stub echoes the raw message")
+
+    def test_canned_reply_streams_word_by_word(self, monkeypatch):
+        """Test a canned reply arrives as one chunk per word that joins back to the reply"""
+        conversation = stub_provider(monkeypatch, reply="Try the Resources page").conversation("s", "system", [])
+
+        async def collect():
+            return [chunk async for chunk in conversation.stream("anything")]
+
+        assert asyncio.run(collect()) == ["Try ", "the ", "Resources ", "page"]
+        print("✓ Stub streams the canned reply word by word")
+
+    def test_latency_is_sampled_from_the_spec(self, monkeypatch):
+        """Test each distribution honours its bounds and a seed makes samples repeatable"""
+        fixed = server.parse_latency("fixed:250")
+        uniform = server.parse_latency("uniform:100:200")
+        assert fixed(None) == 0.25
+        samples = [uniform(server.random.Random(1)) for _ in range(3)]
+        assert all(0.1 <= sample <= 0.2 for sample in samples)
+        assert len(set(samples)) == 1
+        assert server.parse_latency("exponential:0")(None) == 0.0
+        print("✓ Latency specs sample within their bounds")
+
+    @pytest.mark.parametrize("spec", [
+        "fixed", "fixed:1:2", "uniform:100", "normal:1", "exponential", "gamma:1", "fixed:abc", "fixed:-5",
+    ])
+    def test_bad_latency_spec_fails_at_construction(self, monkeypatch, spec):
+        """Test a malformed LLM_STUB_LATENCY is rejected when the provider is built, not on the first chat"""
+        with pytest.raises(ValueError):
+            stub_provider(monkeypatch, latency=spec)
+        print(f"✓ Latency spec '{spec}' rejected at startup")
+
+    def test_providers_are_abstract(self):
+        """Test a provider or conversation missing its core method can't be instantiated"""
+        with pytest.raises(TypeError):
+            server.LlmProvider()
+        with pytest.raises(TypeError):
+            server.Conversation()
+        print("✓ LlmProvider and Conversation are abstract")
+
+    def test_chat_endpoint_with_stub(self, chat_env, monkeypatch):
+        """Test /chat answers opening and follow-up turns through the stub"""
+        monkeypatch.setattr(server, "llm_provider", stub_provider(monkeypatch))
+        first = server.ChatRequest(message="I need housing", session_id="stub")
+
+        async def run():
+            reply = await server.chat_with_ai(first)
+            follow_up = server.ChatRequest(message="In Duluth", session_id="stub", history=[
+                server.ChatMessage(role="user", content="I need housing"),
+                server.ChatMessage(role="assistant", content=reply.response),
+            ])
+            return reply, await server.chat_with_ai(follow_up)
+
+        reply, second = asyncio.run(run())
+        assert reply.response == "I need housing"
+        assert second.response == "In Duluth"
+        print("✓ /chat answers through the stub provider")
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """An in-memory Mongo standing in for server.db, with this worker's seed and snapshot state reset"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    database = mongomock_motor.AsyncMongoMockClient(tz_aware=True)["test_database"]
+    monkeypatch.setattr(server, "db", database)
+    monkeypatch.setattr(server, "_seeded", False)
+    monkeypatch.setattr(server, "snapshot", server.ResourceSnapshot(0, []))
+    monkeypatch.setattr(server, "_snapshot_checked_at", 0.0)
+    return database
+
+
+async def stored_by_name(database):
+    return {doc["name"]: doc async for doc in database.resources.find({}, {"_id": 0})}
+
+
+async def reseed(database):
+    """Forget the recorded seed hash so the next ensure_seeded() runs the upserts again"""
+    await database.meta.delete_one({"_id": "seed"})
+    server._seeded = False
+    return await server.ensure_seeded()
+
+
+class TestSeedUpserts:
+    """Test re-seeding only rewrites resources whose content changed"""
+
+    def test_only_changed_entries_get_new_timestamps_and_seqs(self, mongo, monkeypatch):
+        """Test unchanged seed rows keep updated_at and change_seq while an edited one moves both"""
+        seed = server.load_seed_resources()
+        edited = dict(seed[0], hours="Mon-Fri 9am-5pm (edited)")
+
+        async def run():
+            await server.ensure_seeded()
+            before = await stored_by_name(mongo)
+            monkeypatch.setattr(server, "load_seed_resources", lambda: (edited,) + seed[1:])
+            await reseed(mongo)
+            return before, await stored_by_name(mongo)
+
+        before, after = asyncio.run(run())
+        assert len(after) == len(seed)
+        assert all(doc["content_hash"] for doc in after.values())
+
+        changed = after[edited["name"]]
+        assert changed["hours"] == edited["hours"]
+        assert changed["updated_at"] > before[edited["name"]]["updated_at"]
+        assert changed["change_seq"] > max(doc["change_seq"] for doc in before.values())
+        assert changed["created_at"] == before[edited["name"]]["created_at"]
+        assert changed["id"] == before[edited["name"]]["id"]
+
+        for name, doc in after.items():
+            if name != edited["name"]:
+                assert (doc["updated_at"], doc["change_seq"]) == (before[name]["updated_at"], before[name]["change_seq"])
+        print("✓ Re-seeding restamps only the edited resource")
+
+
+class TestSeedLock:
+    """Test seeding is idempotent and guarded by a Mongo lock across workers"""
+
+    def test_reseeding_upserts_in_place(self, mongo):
+        """Test re-running every upsert keeps one row per seed entry and their ids"""
+        async def run():
+            await server.ensure_seeded()
+            before = await stored_by_name(mongo)
+            # Without stored hashes every entry counts as changed, so each one goes through the upsert again
+            await mongo.resources.update_many({}, {"$unset": {"content_hash": ""}})
+            assert await reseed(mongo)
+            return before, await stored_by_name(mongo), await mongo.resources.count_documents({})
+
+        before, after, count = asyncio.run(run())
+        assert count == len(server.load_seed_resources())
+        assert {doc["id"] for doc in after.values()} == {doc["id"] for doc in before.values()}
+        assert all(after[name]["change_seq"] > before[name]["change_seq"] for name in after)
+        print(f"✓ Re-seeding rewrote {count} resources in place with stable ids")
+
+    def test_lock_contention(self, mongo, monkeypatch):
+        """Test a second worker can't take an unexpired lock or release one it doesn't own"""
+        async def run():
+            assert await server.acquire_lock("seed", 60)
+            assert await server.acquire_lock("seed", 60), "the holder can renew its own lock"
+            monkeypatch.setattr(server, "WORKER_ID", "other-worker")
+            taken = await server.acquire_lock("seed", 60)
+            await server.release_lock("seed")
+            return taken, await mongo.locks.find_one({"_id": "seed"})
+
+        taken, lock = asyncio.run(run())
+        assert taken is False
+        assert lock["owner"] != "other-worker"
+        print("✓ Held lock refused to another worker")
+
+    def test_expired_lock_is_taken_over(self, mongo, monkeypatch):
+        """Test a lock left behind by a crashed worker is taken over once it expires"""
+        async def run():
+            assert await server.acquire_lock("seed", 60)
+            await mongo.locks.update_one(
+                {"_id": "seed"}, {"$set": {"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}}
+            )
+            monkeypatch.setattr(server, "WORKER_ID", "other-worker")
+            taken = await server.acquire_lock("seed", 60)
+            return taken, await mongo.locks.find_one({"_id": "seed"})
+
+        taken, lock = asyncio.run(run())
+        assert taken is True
+        assert lock["owner"] == "other-worker"
+        print("✓ Expired lock taken over by another worker")
+
+    def test_seeding_waits_for_another_worker(self, mongo, monkeypatch):
+        """Test ensure_seeded writes nothing and reports False while another worker holds the lock"""
+        async def run():
+            monkeypatch.setattr(server, "WORKER_ID", "other-worker")
+            await server.acquire_lock("seed", 60)
+            monkeypatch.setattr(server, "WORKER_ID", "this-worker")
+            return await server.ensure_seeded(), await mongo.resources.count_documents({})
+
+        seeded, count = asyncio.run(run())
+        assert seeded is False
+        assert count == 0
+        print("✓ Seeding skipped while another worker holds the lock")
+
+
+async def read_changes(since):
+    return json.loads((await server.get_resource_changes(since=since, limit=server.CHANGES_PAGE_SIZE)).body)
+
+
+def new_resource(name):
+    return server.ResourceCreate(
+        name=name, category="housing", description="Test resource", address="1 Main St", city="Duluth",
+        zip_code="55802", latitude=46.78, longitude=-92.1
+    )
+
+
+class TestChangeFeedWatermark:
+    """Test the change feed never hands out a token beyond a write that is still in flight"""
+
+    def test_feed_holds_back_behind_an_open_reservation(self, mongo):
+        """Test a later committed write stays hidden until an earlier reserved write finishes"""
+        async def run():
+            await server.ensure_seeded()
+            since = (await read_changes(0))["next"]
+
+            slow_write = server.reserve_change_seqs(1)
+            slow_seqs = await slow_write.__aenter__()
+            created = await server.create_resource(new_resource("Watermark Test Housing"))
+            held = await read_changes(since)
+
+            await mongo.resources.insert_one({"id": "late", "change_seq": slow_seqs[0], **new_resource("Late").model_dump()})
+            await slow_write.__aexit__(None, None, None)
+            return since, created, held, await read_changes(since)
+
+        since, created, held, released = asyncio.run(run())
+        assert held["changes"] == [] and held["next"] == since
+        assert [(change["seq"], change["resource"]["id"]) for change in released["changes"]] == [
+            (since + 1, "late"), (since + 2, created.id)
+        ]
+        assert released["next"] == since + 2
+        print("✓ Feed waited for the earlier in-flight write before moving past it")
+
+    def test_expired_reservation_stops_holding_the_feed(self, mongo):
+        """Test a reservation abandoned by a crashed writer is ignored, then pruned, once it expires"""
+        async def run():
+            await server.next_change_seqs(1)
+            created = await server.create_resource(new_resource("After A Crash"))
+            held = await server.committed_change_seq()
+            await mongo.meta.update_one(
+                {"_id": "changes"}, {"$set": {"in_flight.0.expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}}
+            )
+            return created, held, await read_changes(0)
+
+        created, held, changes = asyncio.run(run())
+        meta = asyncio.run(mongo.meta.find_one({"_id": "changes"}))
+        assert meta["in_flight"] == []
+        assert held == 0
+        assert [change["resource"]["id"] for change in changes["changes"]] == [created.id]
+        assert changes["next"] == 2
+        print("✓ Expired reservation no longer holds back the feed")
+
+    def test_feed_reports_inserts_and_deletes(self, mongo):
+        """Test a created resource shows up as an upsert, then as a delete once removed"""
+        async def run():
+            created = await server.create_resource(new_resource("Deleted Later"))
+            inserted = await read_changes(0)
+            removed = await server.delete_resources([created.id, "no-such-id"])
+            return created, inserted, removed, await read_changes(inserted["next"])
+
+        created, inserted, removed, deleted = asyncio.run(run())
+        assert [(change["op"], change["resource"]["id"]) for change in inserted["changes"]] == [("upsert", created.id)]
+        assert removed == [created.id]
+        assert [(change["op"], change["id"]) for change in deleted["changes"]] == [("delete", created.id)]
+        assert deleted["next"] == inserted["next"] + 1
+        print("✓ Changes feed reported the insert and then the tombstone")
+
+
+def ingest_row(name, **fields):
+    return {
+        "name": name, "category": "legal", "description": "Ingested resource", "address": "5 Test Ave",
+        "city": "Duluth", "zip_code": "55802", "latitude": 46.78, "longitude": -92.1, **fields
+    }
+
+
+@pytest.fixture
+def ingest_db(mongo, monkeypatch):
+    """Point the ingester at the in-memory Mongo"""
+    monkeypatch.setattr(ingest_resources, "db", mongo)
+    return mongo
+
+
+class TestIngestErrors:
+    """Test bad input is rejected row by row and partial writes are still published"""
+
+    def test_undecodable_rows_are_rejected_individually(self, ingest_db, tmp_path):
+        """Test broken NDJSON lines and invalid UTF-8 are reported like validation errors and the run carries on"""
+        path = tmp_path / "rows.ndjson"
+        path.write_bytes(b"\n".join([
+            json.dumps(ingest_row("First")).encode(),
+            b'{"name": "Broken",',
+            json.dumps(ingest_row("Latin-1 Caf\u00e9")).encode().replace(b"\\u00e9", b"\xe9"),
+            json.dumps(ingest_row("Last")).encode(),
+        ]))
+        ingest = ingest_resources.Ingest(batch_size=1, dry_run=False)
+        asyncio.run(ingest.run([path]))
+
+        assert (ingest.read, ingest.added, ingest.invalid) == (4, 2, 2)
+        assert ingest.errors[0].startswith(f"{path}:2: invalid JSON")
+        assert ingest.errors[1] == f"{path}:3: text is not valid UTF-8"
+        print("✓ Undecodable rows rejected one by one")
+
+    def test_broken_json_file_is_one_rejected_row(self, ingest_db, tmp_path):
+        """Test a JSON document that doesn't parse is reported and the next file is still loaded"""
+        broken, good = tmp_path / "broken.json", tmp_path / "good.json"
+        broken.write_text('[{"name": "Cut off"')
+        good.write_text(json.dumps([ingest_row("Loaded")]))
+        ingest = ingest_resources.Ingest(batch_size=10, dry_run=False)
+        asyncio.run(ingest.run([broken, good]))
+
+        assert (ingest.added, ingest.invalid) == (1, 1)
+        assert "rest of file skipped" in ingest.errors[0]
+        print("✓ Broken JSON file rejected without stopping the run")
+
+    def test_version_is_published_when_a_later_batch_fails(self, ingest_db, tmp_path, monkeypatch):
+        """Test rows already written are published even though the run raised"""
+        path = tmp_path / "rows.json"
+        path.write_text(json.dumps([ingest_row("Written"), ingest_row("Failed")]))
+        upserts = ingest_resources.resource_upserts
+
+        def fail_second_batch(changes, now, seqs):
+            if changes[0][0]["name"] == "Failed":
+                raise RuntimeError("connection lost")
+            return upserts(changes, now, seqs)
+
+        monkeypatch.setattr(ingest_resources, "resource_upserts", fail_second_batch)
+        monkeypatch.setattr(ingest_resources, "client", ingest_db.client)
+        monkeypatch.setattr(sys, "argv", ["ingest_resources.py", str(path), "--batch-size", "1"])
+
+        async def run():
+            with pytest.raises(RuntimeError):
+                await ingest_resources.main()
+            return await server.read_dataset_version(), await ingest_db.resources.count_documents({})
+
+        version, stored = asyncio.run(run())
+        assert (version, stored) == (1, 1)
+        print("✓ Partial ingest still published a new dataset version")
+
+
+class TestIngestRows:
+    """Test row parsing, content hashes and change classification shared by ingest and seeding"""
+
+    def test_csv_row(self):
+        """Test blank and missing cells are dropped, values stripped and services split on ';'"""
+        row = {"name": " Legal Aid ", "phone": "", "hours": "   ", "services": "Expungement; ;Housing court ", None: ["x"]}
+        assert ingest_resources.csv_row(row) == {"name": "Legal Aid", "services": ["Expungement", "Housing court"]}
+        print("✓ CSV cells normalized")
+
+    def test_content_hash_ignores_key_order_only(self):
+        """Test the hash is stable across key order and changes with any field value"""
+        resource = server.ResourceCreate.model_validate(ingest_row("Hashed")).model_dump()
+        reordered = dict(reversed(list(resource.items())))
+        assert server.content_hash(resource) == server.content_hash(reordered)
+        assert server.content_hash(resource) != server.content_hash(dict(resource, hours="Mon-Fri"))
+        assert len(server.content_hash(resource)) == 64
+        print("✓ Content hash is order independent and value sensitive")
+
+    def test_classification(self):
+        """Test rows are new, changed or unchanged against the stored hashes, including hashless legacy rows"""
+        same, edited, legacy, fresh = [
+            server.ResourceCreate.model_validate(ingest_row(name)).model_dump()
+            for name in ("Same", "Edited", "Legacy", "Fresh")
+        ]
+        existing = {
+            server.natural_key(same): server.content_hash(same),
+            server.natural_key(edited): server.content_hash(dict(edited, hours="old hours")),
+            server.natural_key(legacy): None,
+        }
+        statuses = [server.classify_resource(resource, existing)[0] for resource in (same, edited, legacy, fresh)]
+        assert statuses == ["unchanged", "changed", "changed", "new"]
+        print("✓ Rows classified as unchanged, changed and new")
+
+    def test_created_resources_carry_a_hash(self, mongo):
+        """Test POST /api/resources stores the content hash ingest compares against, and accepts a repeat"""
+        async def run():
+            await server.ensure_indexes()
+            created = await server.create_resource(new_resource("Hash On Create"))
+            again = await server.create_resource(new_resource("Hash On Create"))
+            stored = await mongo.resources.find_one({"id": created.id})
+            return created, again, stored, await server.stored_content_hashes()
+
+        created, again, stored, existing = asyncio.run(run())
+        assert stored["content_hash"] == server.content_hash(new_resource("Hash On Create").model_dump())
+        assert server.classify_resource(new_resource("Hash On Create").model_dump(), existing)[0] == "unchanged"
+        assert again.id != created.id
+        print("✓ Created resources are hashed and the API still accepts repeats")
+
+    def test_retired_unique_index_is_dropped(self, mongo):
+        """Test startup removes the old unique (name, city) index so same-name branches can be stored"""
+        async def run():
+            await mongo.resources.create_index([("name", 1), ("city", 1)], unique=True)
+            await server.ensure_indexes()
+            return await mongo.resources.index_information()
+
+        indexes = asyncio.run(run())
+        assert "name_1_city_1" not in indexes
+        assert "name_1_city_1_address_1_zip_code_1" in indexes
+        print("✓ Retired unique index dropped")
+
+    def test_branches_sharing_a_name_are_kept_apart(self, ingest_db, tmp_path):
+        """Test two branches with one name in one city are both loaded, and only an exact repeat is skipped"""
+        path = tmp_path / "branches.json"
+        path.write_text(json.dumps([
+            ingest_row("Salvation Army", address="1 Lake Ave"),
+            ingest_row("Salvation Army", address="2 Superior St"),
+            ingest_row("Salvation Army", address="2 Superior St"),
+        ]))
+        ingest = ingest_resources.Ingest(batch_size=10, dry_run=False)
+
+        async def run():
+            await ingest.run([path])
+            return sorted([doc["address"] async for doc in ingest_db.resources.find({"name": "Salvation Army"})])
+
+        assert asyncio.run(run()) == ["1 Lake Ave", "2 Superior St"]
+        assert (ingest.added, ingest.duplicates) == (2, 1)
+        print("✓ Same-name branches ingested separately")
+
+
+def http_request(path, **headers):
+    return Request({
+        "type": "http", "method": "GET", "path": path, "query_string": b"",
+        "headers": [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+class TestBootstrapRevalidation:
+    """Test /api/bootstrap conditional requests"""
+
+    def test_304_carries_vary(self, monkeypatch):
+        """Test a matching If-None-Match gets a 304 with the same ETag and Vary: Accept-Encoding"""
+        snapshot = server.ResourceSnapshot(3, make_resources(5))
+
+        async def get_snapshot():
+            return snapshot
+
+        monkeypatch.setattr(server, "get_snapshot", get_snapshot)
+
+        async def run():
+            first = await server.get_bootstrap(http_request("/api/bootstrap", accept_encoding="gzip"), Response())
+            cached = await server.get_bootstrap(
+                http_request("/api/bootstrap", accept_encoding="gzip", if_none_match=first.headers["etag"]), Response()
+            )
+            return first, cached
+
+        first, cached = asyncio.run(run())
+        assert first.status_code == 200 and first.headers["content-encoding"] == "gzip"
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == first.headers["etag"]
+        assert cached.headers["vary"] == first.headers["vary"] == "Accept-Encoding"
+        print("✓ Bootstrap 304 keeps ETag and Vary")
+
+    def test_refused_gzip_gets_identity(self, monkeypatch):
+        """Test a client sending gzip;q=0 gets an uncompressed body"""
+        snapshot = server.ResourceSnapshot(3, make_resources(5))
+
+        async def get_snapshot():
+            return snapshot
+
+        monkeypatch.setattr(server, "get_snapshot", get_snapshot)
+        response = asyncio.run(server.get_bootstrap(http_request("/api/bootstrap", accept_encoding="gzip;q=0"), Response()))
+        assert "content-encoding" not in response.headers
+        assert json.loads(response.body)["version"] == 3
+        print("✓ gzip;q=0 gets an identity body")
+
+
+class TestGeoIndex:
+    """Test nearest-neighbour queries against a brute-force scan"""
+
+    def statewide_index(self, count=5000):
+        rng = server.random.Random(1)
+        index = server.GeoIndex()
+        for i in range(count):
+            index.add({"id": f"r{i}", "latitude": rng.uniform(43.5, 49.0), "longitude": rng.uniform(-97.2, -89.5)})
+        return index
+
+    def brute_force(self, index, lat, lng, radius_km, limit):
+        distances = [
+            (resource_id, server.haversine_km(lat, lng, r_lat, r_lng))
+            for cell in index.cells.values() for resource_id, (r_lat, r_lng) in cell.items()
+        ]
+        return sorted((item for item in distances if item[1] <= radius_km), key=lambda item: item[1])[:limit]
+
+    @pytest.mark.parametrize("lat, lng, radius_km, limit", [
+        (44.98, -93.27, 25, 20),
+        (46.78, -92.10, 300, 200),
+        (89.9, 180.0, 1000, 200),
+        (-45.0, 170.0, 20000, 5),
+    ])
+    def test_matches_brute_force_quickly(self, lat, lng, radius_km, limit):
+        """Test local, polar and far-away queries return the exact nearest set without walking thousands of rings"""
+        index = self.statewide_index()
+        started = time.perf_counter()
+        found = index.nearest(lat, lng, radius_km, limit)
+        elapsed = time.perf_counter() - started
+
+        assert [resource_id for resource_id, _ in found] == [
+            resource_id for resource_id, _ in self.brute_force(index, lat, lng, radius_km, limit)
+        ]
+        assert elapsed < 0.5
+        print(f"✓ nearest({lat}, {lng}, {radius_km} km) returned {len(found)} in {elapsed * 1000:.1f} ms")
+
+
+class TestEmergentStreaming:
+    """Test the real provider streams deltas instead of waiting for the whole completion"""
+
+    def test_deltas_are_yielded_as_they_arrive(self, monkeypatch):
+        """Test each delta reaches the caller before the completion finishes, and the turn is kept"""
+        finished = []
+        requests_sent = []
+
+        async def acompletion(**kwargs):
+            requests_sent.append(kwargs)
+
+            async def chunks():
+                for text in ["Try ", None, "180 ", "Degrees."]:
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+                finished.append(True)
+            return chunks()
+
+        monkeypatch.setattr(server.litellm, "acompletion", acompletion)
+        conversation = server.EmergentProvider().conversation("s", "SYSTEM", [{"role": "system", "content": "SYSTEM"}])
+
+        async def run():
+            received = []
+            async for delta in conversation.stream("I need housing", "Directory matches: X"):
+                received.append((delta, bool(finished)))
+            return received
+
+        received = asyncio.run(run())
+        assert received == [("Try ", False), ("180 ", False), ("Degrees.", False)]
+        assert requests_sent[0]["stream"] is True
+        assert requests_sent[0]["messages"] == [
+            {"role": "system", "content": "SYSTEM\n\nDirectory matches: X"},
+            {"role": "user", "content": "I need housing"},
+        ]
+        assert conversation.turns == [
+            {"role": "user", "content": "I need housing"},
+            {"role": "assistant", "content": "Try 180 Degrees."},
+        ]
+        print("✓ Emergent provider streams deltas as they arrive")
+
+    def test_falls_back_to_a_whole_reply(self, monkeypatch):
+        """Test a streamed request that can't start still answers through LlmChat"""
+        async def acompletion(**kwargs):
+            raise RuntimeError("streaming not allowed for this key")
+
+        monkeypatch.setattr(server.litellm, "acompletion", acompletion)
+        monkeypatch.setattr(server, "LlmChat", RecordingLlmChat)
+        RecordingLlmChat.calls = []
+        conversation = server.EmergentProvider().conversation("s", "SYSTEM", [])
+
+        async def run():
+            return [delta async for delta in conversation.stream("hello")]
+
+        assert asyncio.run(run()) == ["reply 1"]
+        assert conversation.turns[-1] == {"role": "assistant", "content": "reply 1"}
+        print("✓ Emergent provider falls back to a whole reply")
+
+
+class TestSnapshotLoading:
+    """Test snapshot rebuilds don't block the event loop"""
+
+    def test_build_runs_off_the_event_loop(self, mongo, monkeypatch):
+        """Test other requests keep being served while a slow snapshot is built"""
+        class SlowSnapshot(server.ResourceSnapshot):
+            def __init__(self, version, resources):
+                time.sleep(0.3)
+                super().__init__(version, resources)
+
+        monkeypatch.setattr(server, "ResourceSnapshot", SlowSnapshot)
+
+        async def run():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            ticker = asyncio.create_task(tick())
+            await server.load_snapshot(4)
+            ticker.cancel()
+            return ticks
+
+        ticks = asyncio.run(run())
+        assert ticks >= 10
+        assert server.snapshot.version == 4
+        print(f"✓ Event loop ran {ticks} times during a 300 ms snapshot build")
+
+
+class TestAcceptEncoding:
+    """Test Accept-Encoding negotiation for pre-compressed bodies"""
+
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip, deflate, br", True),
+        ("GZIP", True),
+        ("gzip;q=0.5, br", True),
+        ("gzip;q=0", False),
+        ("gzip; q=0.0, identity", False),
+        ("br, *;q=0.1", True),
+        ("br, *;q=0", False),
+        ("*;q=1, gzip;q=0", False),
+        ("identity", False),
+        ("", False),
+    ])
+    def test_q_values(self, header, expected):
+        """Test q=0 refuses gzip and * covers it only when gzip isn't listed"""
+        assert server.accepts_encoding(header, "gzip") is expected
+        print(f"✓ Accept-Encoding '{header}' -> gzip {expected}")